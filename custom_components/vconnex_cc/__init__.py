@@ -1,19 +1,40 @@
 """The Vconnex integration."""
 from __future__ import annotations
 
+from functools import partial
+import importlib
 import logging
+import sys
+from typing import TYPE_CHECKING
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN, PLATFORMS
-from .vconnex_wrap import init_sdk, release_sdk
+from .const import CONF_CLIENT_ID, DOMAIN
+
+if TYPE_CHECKING:
+    from .vconnex_wrap import HomeAssistantVconnexData
 
 LOGGER = logging.getLogger(__name__)
 
 
+async def _async_import_sdk(hass: HomeAssistant) -> None:
+    """Import modules which depend on the SDK, once and off the event loop.
+
+    The SDK pulls in its HTTP and MQTT clients, so it is not imported with the
+    integration.
+    """
+    name = f"{__name__}.services"
+    if name not in sys.modules:
+        await hass.async_add_executor_job(importlib.import_module, name)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Async setup hass config entry."""
+    # pylint: disable=import-outside-toplevel
+    await _async_import_sdk(hass)
+    from .services import async_setup_services
+    from .vconnex_wrap import async_keep_connecting_sdk, init_sdk
 
     hass.data.setdefault(DOMAIN, {})
 
@@ -22,15 +43,61 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         return False
 
     hass.data[DOMAIN][entry.entry_id] = vconnex_data
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_setup_services(hass)
+    await vconnex_data.entity_builder.async_setup_platforms(
+        partial(hass.config_entries.async_forward_entry_setups, entry)
+    )
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
+    if not vconnex_data.device_manager.is_initialized():
+        connect_task = hass.async_create_task(
+            async_keep_connecting_sdk(
+                hass, entry, vconnex_data.device_manager, vconnex_data.snapshot
+            )
+        )
+        entry.async_on_unload(connect_task.cancel)
+
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options and reconcile devices, entities are kept."""
+    vconnex_data: HomeAssistantVconnexData = hass.data[DOMAIN][entry.entry_id]
+    device_manager = vconnex_data.device_manager
+    device_manager.apply_options(entry.options)
+    if device_manager.is_initialized():
+        await device_manager.async_sync_device_list()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    # pylint: disable=import-outside-toplevel
+    from .services import async_unload_services
+    from .vconnex_wrap import async_get_transport_manager, release_sdk
+
+    vconnex_data: HomeAssistantVconnexData = hass.data[DOMAIN][entry.entry_id]
+    unload_ok = await vconnex_data.entity_builder.async_unload_platforms(
+        partial(hass.config_entries.async_unload_platforms, entry)
+    )
     if unload_ok:
-        vconnex_data = hass.data[DOMAIN].pop(entry.entry_id)
-        release_sdk(vconnex_data)
+        hass.data[DOMAIN].pop(entry.entry_id)
+        # A connect in progress releases the SDK when it is cancelled
+        if vconnex_data.device_manager.is_initialized():
+            await vconnex_data.snapshot.async_save()
+            await hass.async_add_executor_job(release_sdk, vconnex_data)
+        async_get_transport_manager(hass).async_release(entry.entry_id)
+        async_unload_services(hass)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove device snapshot and saved token of config entry."""
+    # pylint: disable=import-outside-toplevel
+    await _async_import_sdk(hass)
+    from .vconnex_wrap import DeviceSnapshot, async_get_transport_manager
+
+    await DeviceSnapshot(hass, entry.entry_id, None).async_remove()
+    await async_get_transport_manager(hass).async_remove_api(
+        entry.data[CONF_CLIENT_ID]
+    )
@@ -0,0 +1,135 @@
+"""Rolling window aggregation of device param values."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+from typing import Any
+
+
+class RollingWindow:
+    """Time weighted mean, min and max of values over a rolling time window.
+
+    Each value holds until the next sample. Adding a sample and reading stats are
+    amortized O(1), min and max are kept in monotonic deques.
+    """
+
+    __slots__ = ("duration", "_samples", "_area", "_seq", "_min_q", "_max_q")
+
+    def __init__(self, duration: float) -> None:
+        """Create Rolling Window object."""
+        self.duration = duration
+        self._samples: deque[tuple[int, float, float]] = deque()
+        self._area = 0.0  # value * time of closed segments in samples
+        self._seq = 0
+        self._min_q: deque[tuple[int, float]] = deque()
+        self._max_q: deque[tuple[int, float]] = deque()
+
+    def add(self, now: float, value: float) -> None:
+        """Add sample value at monotonic time now."""
+        if self._samples:
+            _, last_time, last_value = self._samples[-1]
+            if last_value == value:
+                return
+            self._area += last_value * (now - last_time)
+
+        self._seq += 1
+        self._samples.append((self._seq, now, value))
+        while self._min_q and self._min_q[-1][1] >= value:
+            self._min_q.pop()
+        self._min_q.append((self._seq, value))
+        while self._max_q and self._max_q[-1][1] <= value:
+            self._max_q.pop()
+        self._max_q.append((self._seq, value))
+        self._expire(now)
+
+    def mean(self, now: float) -> float | None:
+        """Get time weighted mean of window."""
+        self._expire(now)
+        if not self._samples:
+            return None
+
+        start = now - self.duration
+        _, first_time, first_value = self._samples[0]
+        _, last_time, last_value = self._samples[-1]
+        area = self._area + last_value * (now - last_time)
+        if first_time < start:
+            area -= first_value * (start - first_time)
+            first_time = start
+        if (elapsed := now - first_time) <= 0:
+            return last_value
+        return area / elapsed
+
+    def min(self, now: float) -> float | None:
+        """Get min value of window."""
+        self._expire(now)
+        return self._min_q[0][1] if self._min_q else None
+
+    def max(self, now: float) -> float | None:
+        """Get max value of window."""
+        self._expire(now)
+        return self._max_q[0][1] if self._max_q else None
+
+    def _expire(self, now: float) -> None:
+        """Drop samples whose value ended before window start."""
+        start = now - self.duration
+        samples = self._samples
+        while len(samples) > 1 and samples[1][1] <= start:
+            _, first_time, first_value = samples.popleft()
+            self._area -= first_value * (samples[0][1] - first_time)
+
+        if samples:
+            first_seq = samples[0][0]
+            while self._min_q[0][0] < first_seq:
+                self._min_q.popleft()
+            while self._max_q[0][0] < first_seq:
+                self._max_q.popleft()
+
+
+class RollingWindowRegistry:
+    """Rolling windows of device params, shared by entities."""
+
+    def __init__(self) -> None:
+        """Create Rolling Window Registry object."""
+        self._windows: dict[str, dict[str, dict[float, RollingWindow]]] = {}
+        self._ref_counts: dict[tuple[str, str, float], int] = {}
+
+    def __contains__(self, device_id: str) -> bool:
+        """Check if device has any window."""
+        return device_id in self._windows
+
+    def acquire(self, device_id: str, param: str, duration: float) -> RollingWindow:
+        """Get or create window of device param."""
+        param_windows = self._windows.setdefault(device_id, {}).setdefault(param, {})
+        if (window := param_windows.get(duration)) is None:
+            window = param_windows[duration] = RollingWindow(duration)
+        ref_key = (device_id, param, duration)
+        self._ref_counts[ref_key] = self._ref_counts.get(ref_key, 0) + 1
+        return window
+
+    def release(self, device_id: str, param: str, duration: float) -> None:
+        """Release window of device param, drop it when it is unused."""
+        ref_key = (device_id, param, duration)
+        if (ref_count := self._ref_counts.get(ref_key, 0) - 1) > 0:
+            self._ref_counts[ref_key] = ref_count
+            return
+
+        self._ref_counts.pop(ref_key, None)
+        device_windows = self._windows.get(device_id, {})
+        param_windows = device_windows.get(param, {})
+        param_windows.pop(duration, None)
+        if not param_windows:
+            device_windows.pop(param, None)
+        if not device_windows:
+            self._windows.pop(device_id, None)
+
+    def add_samples(
+        self, device_id: str, param_values: Mapping[str, Any], now: float
+    ) -> None:
+        """Add param values of device to its windows."""
+        for param, param_windows in self._windows.get(device_id, {}).items():
+            try:
+                value = float(param_values[param])
+            except (KeyError, TypeError, ValueError):
+                continue
+            for window in param_windows.values():
+                window.add(now, value)
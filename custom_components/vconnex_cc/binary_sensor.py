@@ -7,17 +7,17 @@ from types import SimpleNamespace
 from vconnex.device import VconnexDevice, VconnexDeviceManager
 
 from homeassistant.components.binary_sensor import (
+    DOMAIN as BINARY_SENSOR_DOMAIN,
     DEVICE_CLASS_SAFETY,
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
-from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, DispatcherSignal
+from .const import DOMAIN, PLATFORM_DEVICE_TYPES
 from .entity import EntityDescListResolver, EntityDescResolver, VconnexEntity
 from .vconnex_wrap import HomeAssistantVconnexData
 
@@ -45,9 +45,16 @@ ENTITY_DESC_EXT_MAP = {
 
 
 def fix_entity_desc_map():
-    """Convert ENTITY_DESC_EXT_MAP object."""
+    """Convert ENTITY_DESC_EXT_MAP object to precomputed merge kwargs by key."""
     for device_type, desc_list in ENTITY_DESC_EXT_MAP.items():
-        desc_list_map = {desc.key: desc for desc in desc_list}
+        desc_list_map = {
+            desc.key: {
+                attr: attr_val
+                for attr, attr_val in vars(desc).items()
+                if attr_val is not None
+            }
+            for desc in desc_list
+        }
         ENTITY_DESC_EXT_MAP[device_type] = desc_list_map
 
 
@@ -61,15 +68,12 @@ def append_entity_desc_ext(param_dict: dict, device: VconnexDevice) -> dict:
     if (device_type := int(device.deviceTypeCode)) in ENTITY_DESC_EXT_MAP:
         entity_desc_ext = ENTITY_DESC_EXT_MAP[device_type].get(key)
         if entity_desc_ext is not None:
-            for attr in vars(entity_desc_ext):
-                attr_val = getattr(entity_desc_ext, attr)
-                if attr_val is not None:
-                    param_dict[attr] = attr_val
+            param_dict.update(entity_desc_ext)
             return param_dict
     return None
 
 
-DEVICE_TYPE_SET: set[int] = set(ENTITY_DESC_EXT_MAP.keys())
+DEVICE_TYPE_SET = PLATFORM_DEVICE_TYPES[Platform.BINARY_SENSOR]
 DEVICE_PARAM_TYPE_SET: set[int] = {}
 ENTITY_DESC_RESOLVER = EntityDescResolver.of(
     BinarySensorEntityDescription
@@ -83,6 +87,8 @@ ENTITY_DESC_LIST_RESOLVER_LIST = [
 class VconnexBinarySensorEntity(VconnexEntity, BinarySensorEntity):
     """Vconnex Binary Sensor Device."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         vconnex_device: VconnexDevice,
@@ -114,26 +120,9 @@ async def async_setup_entry(
 ) -> None:
     """Async setup Home Assistant entry."""
     vconnex_data: HomeAssistantVconnexData = hass.data[DOMAIN][entry.entry_id]
-    device_manager = vconnex_data.device_manager
-
-    @callback
-    def on_device_added(device_ids: list[str]) -> None:
-        """Device added callback."""
-        entities: list[Entity] = []
-        for device_id in device_ids:
-            device = device_manager.device_map[device_id]
-            for description_list_resolver in ENTITY_DESC_LIST_RESOLVER_LIST:
-                description_list = description_list_resolver.from_device(device)
-                if len(description_list) > 0:
-                    for description in description_list:
-                        entities.append(
-                            TargetEntity(
-                                vconnex_device=device,
-                                device_manager=device_manager,
-                                description=description,
-                            )
-                        )
-        async_add_entities(entities)
-
-    async_dispatcher_connect(hass, DispatcherSignal.DEVICE_ADDED, on_device_added)
-    on_device_added(device_ids=device_manager.device_map.keys())
+    vconnex_data.entity_builder.async_register_platform(
+        BINARY_SENSOR_DOMAIN,
+        ENTITY_DESC_LIST_RESOLVER_LIST,
+        TargetEntity,
+        async_add_entities,
+    )
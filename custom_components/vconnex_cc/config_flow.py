@@ -4,24 +4,38 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from vconnex.api import VconnexAPI
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
 from .const import (
+    CONF_ACK_TIMEOUT,
+    CONF_AVAILABILITY_TIMEOUT,
     CONF_CLIENT_ID,
     CONF_CLIENT_SECRET,
+    CONF_COMMAND_WINDOW,
+    CONF_OPTIMISTIC,
+    CONF_POLL_RATE,
     CONF_PROJECT_NAME,
+    CONF_STALE_AFTER,
     CONF_USER_ID,
+    CONF_WARMUP_TIMEOUT,
+    CONF_WARMUP_WORKERS,
+    DEFAULT_ACK_TIMEOUT,
+    DEFAULT_AVAILABILITY_TIMEOUT,
+    DEFAULT_COMMAND_WINDOW,
     DEFAULT_ENDPOINT,
+    DEFAULT_POLL_RATE,
+    DEFAULT_STALE_AFTER,
+    DEFAULT_WARMUP_TIMEOUT,
+    DEFAULT_WARMUP_WORKERS,
     DOMAIN,
     DOMAIN_NAME,
-    PROJECT_CODE,
 )
+from .vconnex_wrap import async_get_transport_manager
 
 LOGGER = logging.getLogger(__name__)
 
@@ -29,7 +43,9 @@ TOKEN_USER_ID = "userId"
 TOKEN_PROJECT_NAME = "projectName"
 
 
-def validate_input(hass: HomeAssistant, user_input: dict[str, Any]) -> dict[str, Any]:
+async def async_validate_input(
+    hass: HomeAssistant, user_input: dict[str, Any]
+) -> dict[str, Any]:
     """Validate the user input allows us to connect."""
     client_id = user_input.get(CONF_CLIENT_ID, "").strip()
     client_secret = user_input.get(CONF_CLIENT_SECRET, "").strip()
@@ -46,10 +62,10 @@ def validate_input(hass: HomeAssistant, user_input: dict[str, Any]) -> dict[str,
 
     is_valid_credentials = False
     try:
-        api = VconnexAPI(
-            DEFAULT_ENDPOINT, client_id, client_secret, project_code=PROJECT_CODE
+        api = await async_get_transport_manager(hass).async_get_api(
+            client_id, client_secret
         )
-        is_valid_credentials = api.is_valid()
+        is_valid_credentials = await api.async_is_valid()
     except Exception:  # pylint: disable=broad-except
         LOGGER.error("Could not connect to endpoint: %s", DEFAULT_ENDPOINT)
         raise CannotConnect from Exception
@@ -58,7 +74,7 @@ def validate_input(hass: HomeAssistant, user_input: dict[str, Any]) -> dict[str,
         LOGGER.error("Could not validate user credentials: %s", client_id)
         raise InvalidCredentials
 
-    token_data = api.get_token_data()
+    token_data = await api.async_get_token_data()
     user_id = token_data.get(TOKEN_USER_ID)
     project_name = token_data.get(TOKEN_PROJECT_NAME)
     if (
@@ -84,6 +100,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -91,9 +115,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
         if user_input is not None:
             try:
-                info = await self.hass.async_add_executor_job(
-                    validate_input, self.hass, user_input
-                )
+                info = await async_validate_input(self.hass, user_input)
 
                 return self.async_create_entry(title=info["title"], data=info["data"])
 
@@ -128,6 +150,70 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle a options flow for Vconnex."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Create Options Flow Handler object."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Async step init."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_WARMUP_WORKERS,
+                        default=options.get(
+                            CONF_WARMUP_WORKERS, DEFAULT_WARMUP_WORKERS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+                    vol.Optional(
+                        CONF_WARMUP_TIMEOUT,
+                        default=options.get(
+                            CONF_WARMUP_TIMEOUT, DEFAULT_WARMUP_TIMEOUT
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=120)),
+                    vol.Optional(
+                        CONF_COMMAND_WINDOW,
+                        default=options.get(
+                            CONF_COMMAND_WINDOW, DEFAULT_COMMAND_WINDOW
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+                    vol.Optional(
+                        CONF_OPTIMISTIC,
+                        default=options.get(CONF_OPTIMISTIC, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_ACK_TIMEOUT,
+                        default=options.get(CONF_ACK_TIMEOUT, DEFAULT_ACK_TIMEOUT),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=120)),
+                    vol.Optional(
+                        CONF_STALE_AFTER,
+                        default=options.get(CONF_STALE_AFTER, DEFAULT_STALE_AFTER),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+                    vol.Optional(
+                        CONF_POLL_RATE,
+                        default=options.get(CONF_POLL_RATE, DEFAULT_POLL_RATE),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=10)),
+                    vol.Optional(
+                        CONF_AVAILABILITY_TIMEOUT,
+                        default=options.get(
+                            CONF_AVAILABILITY_TIMEOUT, DEFAULT_AVAILABILITY_TIMEOUT
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+                }
+            ),
+        )
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
@@ -2,22 +2,28 @@
 
 from __future__ import annotations
 
-from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
-from homeassistant.components.cover import DOMAIN as COVER_DOMAIN
-from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
-from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import Platform
 
 DOMAIN = "vconnex_cc"
 DOMAIN_NAME = "Vconnex CC"
 PROJECT_CODE = "HASS"
 
 PLATFORMS = [
-    SWITCH_DOMAIN,
-    SENSOR_DOMAIN,
-    BINARY_SENSOR_DOMAIN,
-    COVER_DOMAIN,
+    Platform.SWITCH,
+    Platform.SENSOR,
+    Platform.BINARY_SENSOR,
+    Platform.COVER,
 ]
 
+# Device types of each platform, platform modules accept these types and
+# platforms are only loaded when a device of their types exists.
+PLATFORM_DEVICE_TYPES: dict[str, frozenset[int]] = {
+    Platform.SWITCH: frozenset({3010, 3011, 3012, 3015, 3016, 3017, 3018, 3043, 3052}),
+    Platform.SENSOR: frozenset({3009}),
+    Platform.BINARY_SENSOR: frozenset({3043, 3052}),
+    Platform.COVER: frozenset({3040, 3041, 3042}),
+}
+
 DEFAULT_ENDPOINT = "https://hass-api.vconnex.vn"
 
 CONF_CLIENT_ID = "client_id"
@@ -29,6 +35,28 @@ CONF_PASSWORD = "password"
 CONF_ENDPOINT = "endpoint"
 CONF_COUNTRY = "country"
 
+CONF_WARMUP_WORKERS = "warmup_workers"
+CONF_WARMUP_TIMEOUT = "warmup_timeout"
+CONF_COMMAND_WINDOW = "command_window"
+CONF_OPTIMISTIC = "optimistic"
+CONF_ACK_TIMEOUT = "ack_timeout"
+CONF_STALE_AFTER = "stale_after"
+CONF_POLL_RATE = "poll_rate"
+CONF_AVAILABILITY_TIMEOUT = "availability_timeout"
+
+DEFAULT_WARMUP_WORKERS = 8
+DEFAULT_WARMUP_TIMEOUT = 10
+DEFAULT_COMMAND_WINDOW = 50  # milliseconds
+DEFAULT_ACK_TIMEOUT = 10
+DEFAULT_STALE_AFTER = 1800  # seconds, 0 to disable
+DEFAULT_POLL_RATE = 1  # requests per second
+DEFAULT_AVAILABILITY_TIMEOUT = 3600  # seconds, 0 to disable
+
+# Device types of switch and cover entities, their data are retrieved first
+CONTROLLABLE_DEVICE_TYPES = (
+    PLATFORM_DEVICE_TYPES[Platform.SWITCH] | PLATFORM_DEVICE_TYPES[Platform.COVER]
+)
+
 
 class DispatcherSignal:
     """DispatcherSignal."""
@@ -38,6 +66,9 @@ class DispatcherSignal:
     DEVICE_REMOVED = f"{DOMAIN}.device_removed"
 
 
+SERVICE_SET_MANY = "set_many"
+
+
 class CommandName:
     """Device command name."""
 
@@ -45,6 +76,13 @@ class CommandName:
     GET_DATA = "CmdGetData"
 
 
+class MessageName:
+    """Device data message name."""
+
+    GET_DATA = CommandName.GET_DATA
+    EXTENDED_DEVICE_DATA = "ExtendedDeviceData"
+
+
 class ParamType:
     """Device Param Type."""
 
@@ -3,24 +3,36 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import timedelta
+import time
+from typing import Any
 
+from vconnex.api import ReturnCode
 from vconnex.device import VconnexDevice, VconnexDeviceManager
+import voluptuous as vol
 
 from homeassistant.components.cover import (
+    DOMAIN as COVER_DOMAIN,
     DEVICE_CLASS_CURTAIN,
     CoverEntity,
     CoverEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
-from homeassistant.helpers.entity import Entity
+from homeassistant.const import Platform
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 
-from .const import DOMAIN, CommandName, DispatcherSignal, ParamType
+from .const import DOMAIN, PLATFORM_DEVICE_TYPES, CommandName, ParamType
 from .entity import EntityDescListResolver, EntityDescResolver, VconnexEntity
 from .vconnex_wrap import HomeAssistantVconnexData
 
+ESTIMATE_INTERVAL = timedelta(seconds=1)
+DEFAULT_TRAVEL_TIME = 25  # seconds of full travel
+CALIBRATION_MIN_DELTA = 20  # position percent
+CALIBRATION_WEIGHT = 0.3
+TARGET_MOVE_TIMEOUT = 10  # seconds for requested move to start
+
 
 @dataclass
 class CoverEntityDescriptionExt(CoverEntityDescription):
@@ -70,6 +82,80 @@ DEVICE_ENTITY_MAP = {
 }
 
 
+class CoverTravelModel:
+    """Position model of moving cover by travel time.
+
+    Travel time of full open is calibrated from observed moves, position is
+    estimated at fixed rate from last known position and corrected by real one.
+    """
+
+    __slots__ = (
+        "travel_time",
+        "direction",
+        "target",
+        "_start_time",
+        "_start_position",
+        "_move_time",
+        "_move_position",
+    )
+
+    def __init__(self, travel_time: float = DEFAULT_TRAVEL_TIME) -> None:
+        """Create Cover Travel Model object."""
+        self.travel_time = travel_time
+        self.direction = 0
+        self.target: int | None = None
+        self._start_time = 0.0
+        self._start_position = 0.0
+        self._move_time = 0.0
+        self._move_position = 0.0
+
+    @property
+    def is_moving(self) -> bool:
+        """Check if cover is moving."""
+        return self.direction != 0
+
+    def start(self, now: float, position: float, direction: int) -> None:
+        """Start move from position, direction is 1 to open or -1 to close."""
+        self.direction = direction
+        self.target = None
+        self._start_time = self._move_time = now
+        self._start_position = self._move_position = position
+
+    def correct(self, now: float, position: float) -> None:
+        """Correct estimate by real position."""
+        self._start_time = now
+        self._start_position = position
+
+    def stop(self, now: float, position: float | None) -> None:
+        """Stop move at real position and calibrate travel time."""
+        if self.is_moving and position is not None:
+            delta = abs(position - self._move_position)
+            elapsed = now - self._move_time
+            if delta >= CALIBRATION_MIN_DELTA and elapsed > 0:
+                self.travel_time += CALIBRATION_WEIGHT * (
+                    elapsed * 100 / delta - self.travel_time
+                )
+        self.direction = 0
+        self.target = None
+
+    def estimate(self, now: float) -> float:
+        """Estimate position of moving cover."""
+        position = self._start_position + self.direction * (
+            (now - self._start_time) * 100 / self.travel_time
+        )
+        low, high = 0, 100
+        if self.target is not None:
+            if self.direction > 0:
+                high = self.target
+            else:
+                low = self.target
+        return min(max(position, low), high)
+
+    def is_expired(self, now: float) -> bool:
+        """Check if move lasts much longer than full travel."""
+        return now - self._move_time > 2 * self.travel_time
+
+
 class EntityDescListResolverExt(EntityDescListResolver):
     """Entity Description List Resolver Extend."""
 
@@ -82,7 +168,7 @@ class EntityDescListResolverExt(EntityDescListResolver):
         return []
 
 
-DEVICE_TYPE_SET: set[int] = set(DEVICE_ENTITY_MAP.keys())
+DEVICE_TYPE_SET = PLATFORM_DEVICE_TYPES[Platform.COVER]
 DEVICE_PARAM_TYPE_SET: set[int] = {ParamType.ON_OFF, ParamType.OPEN_CLOSE}
 ENTITY_DESC_RESOLVER = EntityDescResolver.of(CoverEntityDescriptionExt)
 
@@ -96,6 +182,8 @@ ENTITY_DESC_LIST_RESOLVER_LIST = [
 class VconnexCoverEntity(VconnexEntity, CoverEntity):
     """Vconnex Cover Device."""
 
+    __slots__ = ("_travel_model", "_unsub_estimate", "_pending_target")
+
     def __init__(
         self,
         vconnex_device: VconnexDevice,
@@ -112,12 +200,110 @@ class VconnexCoverEntity(VconnexEntity, CoverEntity):
         self.entity_id = self._attr_unique_id
         if description.index != 0 and self._attr_name is not None:
             self._attr_name = f"{self._attr_name} {description.index}"
+        self._travel_model = CoverTravelModel()
+        self._unsub_estimate: CALLBACK_TYPE | None = None
+        self._pending_target: tuple[int, float] | None = None
+
+    @property
+    def watched_params(self) -> set[str]:
+        """Get params which state of entity depends on."""
+        return {
+            self.entity_description.open_param,
+            self.entity_description.close_param,
+            self.entity_description.open_position_param,
+        }
 
     @property
     def current_cover_position(self) -> int | None:
-        """Return current position of cover."""
+        """Return current position of cover, estimated while it is moving."""
+        if self._travel_model.is_moving:
+            return round(self._travel_model.estimate(time.monotonic()))
+        return self._get_real_position()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return calibrated travel time of cover."""
+        return {"travel_time": round(self._travel_model.travel_time, 1)}
+
+    def _get_real_position(self) -> int | None:
+        """Get last reported position of cover."""
         return self.get_data(self.entity_description.open_position_param)
 
+    async def async_will_remove_from_hass(self) -> None:
+        """Call when entity will be removed."""
+        self._stop_estimate()
+
+    @callback
+    def _on_device_updated(self, changed_params: set[str] | None = None) -> None:
+        """Follow move of cover, then write state."""
+        self._sync_travel_model(
+            changed_params is None
+            or self.entity_description.open_position_param in changed_params
+        )
+        super()._on_device_updated(changed_params)
+
+    @callback
+    def _sync_travel_model(self, position_changed: bool = False) -> None:
+        """Start, correct or stop travel model by move state of cover."""
+        now = time.monotonic()
+        model = self._travel_model
+        direction = 1 if self.is_opening else -1 if self.is_closing else 0
+        position = self._get_real_position()
+
+        if direction == 0:
+            if model.is_moving:
+                model.stop(now, position)
+                self._stop_estimate()
+            return
+
+        if position is None:
+            return
+        if direction != model.direction:
+            model.start(
+                now,
+                model.estimate(now) if model.is_moving else position,
+                direction,
+            )
+        elif position_changed:
+            model.correct(now, position)
+        self._apply_pending_target(now)
+
+        if self._unsub_estimate is None:
+            self._unsub_estimate = async_track_time_interval(
+                self.hass, self._async_publish_estimate, ESTIMATE_INTERVAL
+            )
+
+    @callback
+    def _apply_pending_target(self, now: float) -> None:
+        """Stop estimate at requested position once cover moves toward it."""
+        if self._pending_target is None:
+            return
+        target, request_time = self._pending_target
+        model = self._travel_model
+        if now - request_time > TARGET_MOVE_TIMEOUT:
+            # Requested move is not observed
+            self._pending_target = None
+        elif model.is_moving:
+            self._pending_target = None
+            if (target - model.estimate(now)) * model.direction > 0:
+                model.target = target
+
+    @callback
+    def _async_publish_estimate(self, _now=None) -> None:
+        """Publish estimated position of moving cover."""
+        if self._travel_model.is_expired(time.monotonic()):
+            # Stop of move is not reported
+            self._travel_model.stop(time.monotonic(), None)
+            self._stop_estimate()
+        self.async_write_ha_state()
+
+    @callback
+    def _stop_estimate(self) -> None:
+        """Stop publishing estimated position."""
+        if self._unsub_estimate is not None:
+            self._unsub_estimate()
+            self._unsub_estimate = None
+
     @property
     def is_opening(self) -> bool | None:
         """Return if the cover is opening or not."""
@@ -141,30 +327,41 @@ class VconnexCoverEntity(VconnexEntity, CoverEntity):
             else None
         )
 
-    def open_cover(self, **kwargs):
+    def get_command_values(self, value: Any) -> dict[str, Any] | None:
+        """Get CmdSetData values which move cover to position."""
+        position = vol.All(vol.Coerce(int), vol.Range(min=0, max=100))(value)
+        return {self.entity_description.open_position_param: position}
+
+    async def async_open_cover(self, **kwargs):
         """Open the cover."""
-        self._send_command(
-            CommandName.SET_DATA, {self.entity_description.open_param: 1}
+        await self._async_set_data(
+            {self.entity_description.open_param: 1}, optimistic=True
         )
+        self._sync_travel_model()
 
-    def close_cover(self, **kwargs):
+    async def async_close_cover(self, **kwargs):
         """Close cover."""
-        self._send_command(
-            CommandName.SET_DATA, {self.entity_description.close_param: 1}
+        await self._async_set_data(
+            {self.entity_description.close_param: 1}, optimistic=True
         )
+        self._sync_travel_model()
 
-    def set_cover_position(self, **kwargs):
+    async def async_set_cover_position(self, **kwargs):
         """Move the cover to a specific position."""
         param_dict = dict(kwargs)
         if "position" in param_dict:
-            self._send_command(
+            self._pending_target = None
+            result = await self._async_send_command(
                 CommandName.SET_DATA,
                 {self.entity_description.open_position_param: param_dict["position"]},
             )
+            if result == ReturnCode.SUCCESS:
+                self._pending_target = (param_dict["position"], time.monotonic())
+                self._sync_travel_model()
 
-    def stop_cover(self, **kwargs):
+    async def async_stop_cover(self, **kwargs):
         """Stop the cover."""
-        self._send_command(
+        await self._async_send_command(
             CommandName.SET_DATA, {self.entity_description.stop_param: 1}
         )
 
@@ -177,26 +374,6 @@ async def async_setup_entry(
 ) -> None:
     """Async setup Home Assistant entry."""
     vconnex_data: HomeAssistantVconnexData = hass.data[DOMAIN][entry.entry_id]
-    device_manager = vconnex_data.device_manager
-
-    @callback
-    def on_device_added(device_ids: list[str]) -> None:
-        """Device added callback."""
-        entities: list[Entity] = []
-        for device_id in device_ids:
-            device = device_manager.device_map[device_id]
-            for description_list_resolver in ENTITY_DESC_LIST_RESOLVER_LIST:
-                description_list = description_list_resolver.from_device(device)
-                if len(description_list) > 0:
-                    for description in description_list:
-                        entities.append(
-                            TargetEntity(
-                                vconnex_device=device,
-                                device_manager=device_manager,
-                                description=description,
-                            )
-                        )
-        async_add_entities(entities)
-
-    async_dispatcher_connect(hass, DispatcherSignal.DEVICE_ADDED, on_device_added)
-    on_device_added(device_ids=device_manager.device_map.keys())
+    vconnex_data.entity_builder.async_register_platform(
+        COVER_DOMAIN, ENTITY_DESC_LIST_RESOLVER_LIST, TargetEntity, async_add_entities
+    )
@@ -0,0 +1,30 @@
+"""Diagnostics support for Vconnex."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .vconnex_wrap import HomeAssistantVconnexData, async_get_transport_manager
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    vconnex_data: HomeAssistantVconnexData = hass.data[DOMAIN][entry.entry_id]
+    device_manager = vconnex_data.device_manager
+
+    return {
+        "options": dict(entry.options),
+        "device_count": len(device_manager.device_map),
+        "metrics": device_manager.metrics.as_dict(),
+        "command_queue_depth": device_manager.command_batcher.queue_depth,
+        "entity_registration": vconnex_data.entity_builder.startup_report,
+        "transport": {
+            **async_get_transport_manager(hass).get_entry_usage(entry.entry_id),
+            "push_connected": device_manager.is_push_connected(),
+        },
+    }
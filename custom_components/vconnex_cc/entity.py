@@ -1,16 +1,19 @@
 """Base entity of Vconnex integration."""
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Sequence, Set as AbstractSet
 import logging
+import sys
 from typing import Any, Generic, TypeVar
 
-from vconnex.device import VconnexDevice, VconnexDeviceManager
+from vconnex.device import VconnexDevice
 
+from homeassistant.core import callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
-from homeassistant.helpers.entity import DeviceInfo, Entity, EntityDescription
+from homeassistant.helpers.entity import Entity, EntityDescription
 
-from .const import DOMAIN, DOMAIN_NAME, CommandName, DispatcherSignal
+from .const import DOMAIN, CommandName, DispatcherSignal, MessageName
+from .vconnex_wrap import VconnexDeviceManagerExt
 
 LOGGER = logging.getLogger(__name__)
 
@@ -43,7 +46,7 @@ class EntityDescResolver(Generic[T]):
 
         new_param_dict = {}
 
-        new_param_dict["key"] = param_dict["paramKey"]
+        new_param_dict["key"] = sys.intern(param_dict["paramKey"])
         new_param_dict["name"] = param_dict["name"]
 
         new_param_dict.update(self._additional_param_value)
@@ -84,7 +87,7 @@ class EntityDescListResolver:
 
     def __init__(
         self,
-        device_types: set[int],
+        device_types: AbstractSet[int],
         param_types: set[int],
         resolver: EntityDescResolver,
     ) -> None:
@@ -92,51 +95,74 @@ class EntityDescListResolver:
         self._accept_device_types = device_types
         self._accept_param_types = param_types
         self._entity_desc_resolver: EntityDescResolver = resolver
+        self._cache: dict[tuple[int, tuple], tuple] = {}
 
-    def from_device(self, device: VconnexDevice) -> list:
-        """Get Description Entity List from device."""
-        if int(device.deviceTypeCode) in self._accept_device_types:
+    @property
+    def device_types(self) -> AbstractSet[int]:
+        """Get accepted device types."""
+        return self._accept_device_types
+
+    def from_device(self, device: VconnexDevice) -> Sequence:
+        """Get Description Entity List from device.
+
+        Devices of the same type and param schema share one resolved tuple.
+        """
+        device_type_code = int(device.deviceTypeCode)
+        if device_type_code in self._accept_device_types:
             if device is not None and len(param_list := device.params) > 0:
-                description_list = []
-                for param in param_list:
-                    if (
-                        len(self._accept_param_types) == 0
-                        or int(param.get("type", 0)) in self._accept_param_types
-                    ):
-                        description = self._entity_desc_resolver.from_param(
-                            param, device
-                        )
-                        if description is not None:
-                            description_list.append(description)
+                cache_key = (device_type_code, self._param_fingerprint(param_list))
+                if (description_list := self._cache.get(cache_key)) is None:
+                    description_list = self._cache[cache_key] = tuple(
+                        self._resolve_param_list(param_list, device)
+                    )
                 return description_list
-        return []
+        return ()
+
+    def _resolve_param_list(self, param_list: list[dict], device: VconnexDevice):
+        """Resolve entity descriptions of accepted params."""
+        for param in param_list:
+            if (
+                len(self._accept_param_types) == 0
+                or int(param.get("type", 0)) in self._accept_param_types
+            ):
+                description = self._entity_desc_resolver.from_param(param, device)
+                if description is not None:
+                    yield description
+
+    @staticmethod
+    def _param_fingerprint(param_list: list[dict]) -> tuple:
+        """Get fingerprint of param schema."""
+        return tuple(
+            (param.get("paramKey"), param.get("name"), param.get("type"))
+            for param in param_list
+        )
 
 
 class VconnexEntity(Entity):
-    """Vconnex Entity."""
+    """Vconnex Entity.
+
+    Own attributes are kept in slots, device info is shared by all entities of
+    the device. State is written on pushed updates, entities are not polled.
+    """
+
+    __slots__ = ("vconnex_device", "device_manager", "_optimistic_values")
+
+    _attr_should_poll = False
 
     def __init__(
         self,
         vconnex_device: VconnexDevice,
-        device_manager: VconnexDeviceManager,
+        device_manager: VconnexDeviceManagerExt,
         description: EntityDescription,
     ) -> None:
         """Create base entity object."""
         self.vconnex_device = vconnex_device
         self.device_manager = device_manager
         self.entity_description = description
+        self._optimistic_values: dict[str, Any] | None = None
 
         self._attr_unique_id = f"{DOMAIN}.{vconnex_device.deviceId}"
-
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, vconnex_device.deviceId)},
-            manufacturer=DOMAIN_NAME,
-            name=vconnex_device.name,
-            model=f"[{vconnex_device.deviceTypeCode}] {vconnex_device.deviceTypeName}",
-            sw_version=(
-                vconnex_device.version if hasattr(vconnex_device, "version") else None
-            ),
-        )
+        self._attr_device_info = device_manager.get_device_info(vconnex_device)
 
         if description is not None and description.name is not None:
             self._attr_name = f"[{vconnex_device.name}] {description.name}"
@@ -146,28 +172,73 @@ class VconnexEntity(Entity):
     @property
     def available(self) -> bool:
         """Get available status."""
-        return len(self.vconnex_device.data) > 0
+        device_availability = self.device_manager.availability
+        return len(self.vconnex_device.data) > 0 and (
+            device_availability.is_available(self.vconnex_device.deviceId)
+        )
+
+    @property
+    def watched_params(self) -> set[str]:
+        """Get params which state of entity depends on."""
+        return {self.entity_description.key}
 
     async def async_added_to_hass(self) -> None:
         """Call when entity is added."""
-        async_dispatcher_connect(
-            self.hass,
-            f"{DispatcherSignal.DEVICE_UPDATED}.{self.vconnex_device.deviceId}",
-            self.async_write_ha_state,
+        entity_id, entities = self.entity_id, self.device_manager.entities
+        entities[entity_id] = self
+        self.async_on_remove(lambda: entities.pop(entity_id, None))
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"{DispatcherSignal.DEVICE_UPDATED}.{self.vconnex_device.deviceId}",
+                self._on_device_updated,
+            )
         )
-
-        async_dispatcher_connect(
-            self.hass,
-            f"{DispatcherSignal.DEVICE_REMOVED}.{self.vconnex_device.deviceId}",
-            self.async_write_ha_state,
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"{DispatcherSignal.DEVICE_REMOVED}.{self.vconnex_device.deviceId}",
+                self._on_device_removed,
+            )
         )
 
-    def _get_device_data(self, name: str) -> Any:
-        """Get device data message."""
+    @callback
+    def _on_device_removed(self) -> None:
+        """Remove entity of removed device, its registry entry is kept."""
+        self.hass.async_create_task(self.async_remove(force_remove=True))
+
+    @callback
+    def _on_device_updated(self, changed_params: set[str] | None = None) -> None:
+        """Write state if any watched param is changed.
+
+        Entities are not polled, so pushed updates of other params of the device
+        cause no state write.
+        """
+        if changed_params is None or not self.watched_params.isdisjoint(
+            changed_params
+        ):
+            self.async_write_ha_state()
+
+    def get_command_values(self, value: Any) -> dict[str, Any] | None:
+        """Get CmdSetData values which set entity to value, None if not supported."""
+        return None
+
+    def _get_message_data(
+        self,
+        message_name: str,
+        param: str,
+        converter: Callable[[Any, VconnexEntity], Any] = None,
+    ) -> Any:
+        """Get param data of device data message."""
         try:
-            device_data = self.vconnex_device.data
-            if name in device_data:
-                return self.vconnex_device.data.get(name)
+            param_values = self.device_manager.data_index.get_values(
+                self.vconnex_device, message_name
+            )
+            if param in param_values:
+                param_value = param_values[param]
+                return (
+                    param_value if converter is None else converter(param_value, self)
+                )
         except Exception:  # pylint: disable=broad-except
             LOGGER.exception("Something went wrong!!!")
 
@@ -177,25 +248,55 @@ class VconnexEntity(Entity):
         self, param, converter: Callable[[Any, VconnexEntity], Any] = None
     ) -> Any:
         """Get data of CmdGetData message."""
-        try:
-            data_dict = self._get_device_data(CommandName.GET_DATA)
-            if data_dict is not None and "devV" in data_dict:
-                d_values = data_dict.get("devV")
-                for d_value in d_values:
-                    if d_value.get("param") == param:
-                        param_value = d_value.get("value")
-                        return (
-                            param_value
-                            if converter is None
-                            else converter(param_value, self)
-                        )
-        except Exception:  # pylint: disable=broad-except
-            LOGGER.exception("Something went wrong!!!")
+        if self._optimistic_values and param in self._optimistic_values:
+            param_value = self._optimistic_values[param]
+            return param_value if converter is None else converter(param_value, self)
+        return self._get_message_data(MessageName.GET_DATA, param, converter)
 
-        return None
+    async def _async_send_command(self, command: str, values: dict[str, Any]) -> int:
+        """Send command of device."""
+        LOGGER.debug(
+            "Sending commands for device %s: %s", self.vconnex_device.deviceId, values
+        )
+        return await self.device_manager.command_batcher.async_send_command(
+            self.vconnex_device.deviceId, command, values
+        )
+
+    async def _async_set_data(
+        self, values: dict[str, Any], optimistic: bool = False
+    ) -> int:
+        """Queue CmdSetData command and track its acknowledgement.
 
-    def _send_command(self, command: str, values: dict[str, Any]) -> None:
+        The acknowledgement is cancelled when the request fails. In optimistic
+        mode, requested values are shown until they are confirmed by device data,
+        or rolled back when the confirmation times out.
+        """
         LOGGER.debug(
             "Sending commands for device %s: %s", self.vconnex_device.deviceId, values
         )
-        self.device_manager.send_commands(self.vconnex_device.deviceId, command, values)
+        queued = self.device_manager.command_batcher.async_enqueue(
+            self.vconnex_device.deviceId, CommandName.SET_DATA, values, expect_ack=True
+        )
+        if optimistic and self.device_manager.optimistic:
+            if self._optimistic_values is None:
+                self._optimistic_values = {}
+            self._optimistic_values.update(values)
+            queued.ack.add_done_callback(lambda _: self._end_optimistic(values))
+            self.async_write_ha_state()
+
+        return await queued.result
+
+    @callback
+    def _end_optimistic(self, values: dict[str, Any]) -> None:
+        """Clear optimistic values which are not overridden by newer command."""
+        if self._optimistic_values is None:
+            return
+        for param, value in values.items():
+            if param in self._optimistic_values and (
+                self._optimistic_values[param] == value
+            ):
+                self._optimistic_values.pop(param)
+        if not self._optimistic_values:
+            self._optimistic_values = None
+        if self.hass is not None:
+            self.async_write_ha_state()
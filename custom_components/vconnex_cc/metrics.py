@@ -0,0 +1,97 @@
+"""Runtime metrics of Vconnex integration."""
+from __future__ import annotations
+
+from typing import Any
+
+
+class CounterMetric:
+    """Counter metric."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        """Create Counter Metric object."""
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        """Increase counter."""
+        self.value += amount
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get metric as dict."""
+        return {"value": self.value}
+
+
+class StatMetric:
+    """Statistic metric of recorded values."""
+
+    __slots__ = ("count", "total", "min", "max", "last")
+
+    def __init__(self) -> None:
+        """Create Stat Metric object."""
+        self.count = 0
+        self.total = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+        self.last: float | None = None
+
+    def record(self, value: float) -> None:
+        """Record value."""
+        self.count += 1
+        self.total += value
+        self.last = value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float | None:
+        """Get mean value."""
+        return self.total / self.count if self.count > 0 else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get metric as dict."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "last": self.last,
+        }
+
+
+class LatencyMetric(StatMetric):
+    """Latency metric, values are in seconds."""
+
+    __slots__ = ()
+
+
+class MetricRegistry:
+    """Metric registry."""
+
+    def __init__(self) -> None:
+        """Create Metric Registry object."""
+        self._metrics: dict[str, CounterMetric | StatMetric] = {}
+
+    def counter(self, name: str) -> CounterMetric:
+        """Get or create counter metric."""
+        if (metric := self._metrics.get(name)) is None:
+            metric = self._metrics[name] = CounterMetric()
+        return metric
+
+    def stat(self, name: str) -> StatMetric:
+        """Get or create statistic metric."""
+        if (metric := self._metrics.get(name)) is None:
+            metric = self._metrics[name] = StatMetric()
+        return metric
+
+    def latency(self, name: str) -> LatencyMetric:
+        """Get or create latency metric."""
+        if (metric := self._metrics.get(name)) is None:
+            metric = self._metrics[name] = LatencyMetric()
+        return metric
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get all metrics as dict."""
+        return {name: metric.as_dict() for name, metric in self._metrics.items()}
@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from datetime import timedelta
 import logging
+import time
 from typing import Any
 
 from vconnex.device import VconnexDevice, VconnexDeviceManager
 
 from homeassistant.components.sensor import (
+    DOMAIN as SENSOR_DOMAIN,
     STATE_CLASS_MEASUREMENT,
     STATE_CLASS_TOTAL_INCREASING,
     SensorEntity,
@@ -25,19 +28,23 @@ from homeassistant.const import (
     ELECTRIC_POTENTIAL_VOLT,
     ENERGY_KILO_WATT_HOUR,
     POWER_WATT,
+    Platform,
 )
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
-from homeassistant.helpers.entity import Entity
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.helpers.typing import StateType
 
-from .const import DOMAIN, DispatcherSignal, ParamType
+from .aggregate import RollingWindow
+from .const import DOMAIN, PLATFORM_DEVICE_TYPES, MessageName, ParamType
 from .entity import EntityDescListResolver, EntityDescResolver, VconnexEntity
-from .vconnex_wrap import HomeAssistantVconnexData
+from .vconnex_wrap import HomeAssistantVconnexData, VconnexDeviceManagerExt
 
 LOGGER = logging.getLogger(__name__)
 
+# Refresh interval of aggregate sensors, other sensors are written on push
+AGGREGATE_REFRESH_INTERVAL = timedelta(seconds=15)
+
 
 @dataclass
 class SensorEntityDescriptionExt(SensorEntityDescription):
@@ -45,6 +52,14 @@ class SensorEntityDescriptionExt(SensorEntityDescription):
 
     value_converter: Callable[[Any, VconnexEntity], Any] | None = None
     extended_param: bool = False
+    # Throttled writes, changes below thresholds are written at interval end
+    min_write_interval: float | None = None
+    abs_change_threshold: float | None = None
+    rel_change_threshold: float | None = None
+    # Aggregate of source param over rolling window (seconds)
+    aggregate: str | None = None
+    aggregate_window: float | None = None
+    source_key: str | None = None
 
 
 ENTITY_DESC_EXT_MAP = {
@@ -55,18 +70,24 @@ ENTITY_DESC_EXT_MAP = {
             device_class=DEVICE_CLASS_CURRENT,
             state_class=STATE_CLASS_MEASUREMENT,
             native_unit_of_measurement=ELECTRIC_CURRENT_AMPERE,
+            min_write_interval=30,
+            abs_change_threshold=0.5,
         ),
         SensorEntityDescriptionExt(
             key="Voltage",
             device_class=DEVICE_CLASS_VOLTAGE,
             state_class=STATE_CLASS_MEASUREMENT,
             native_unit_of_measurement=ELECTRIC_POTENTIAL_VOLT,
+            min_write_interval=60,
+            abs_change_threshold=5,
         ),
         SensorEntityDescriptionExt(
             key="Power",
             device_class=DEVICE_CLASS_POWER,
             state_class=STATE_CLASS_MEASUREMENT,
             native_unit_of_measurement=POWER_WATT,
+            min_write_interval=30,
+            rel_change_threshold=0.1,
         ),
         SensorEntityDescriptionExt(
             key="EnergyCount",
@@ -124,9 +145,16 @@ ENTITY_DESC_EXT_MAP = {
 
 
 def fix_entity_desc_map():
-    """Convert ENTITY_DESC_EXT_MAP object."""
+    """Convert ENTITY_DESC_EXT_MAP object to precomputed merge kwargs by key."""
     for device_type, desc_list in ENTITY_DESC_EXT_MAP.items():
-        desc_list_map = {desc.key: desc for desc in desc_list}
+        desc_list_map = {
+            desc.key: {
+                attr: attr_val
+                for attr, attr_val in vars(desc).items()
+                if attr_val is not None
+            }
+            for desc in desc_list
+        }
         ENTITY_DESC_EXT_MAP[device_type] = desc_list_map
 
 
@@ -141,27 +169,72 @@ def append_entity_desc_ext(param_dict: dict, device: VconnexDevice) -> dict:
     if device_type in ENTITY_DESC_EXT_MAP:
         entity_desc_ext = ENTITY_DESC_EXT_MAP[device_type].get(key)
         if entity_desc_ext is not None:
-            for attr in vars(entity_desc_ext):
-                attr_val = getattr(entity_desc_ext, attr)
-                if attr_val is not None:
-                    param_dict[attr] = attr_val
+            param_dict.update(entity_desc_ext)
     return param_dict
 
 
-DEVICE_TYPE_SET: set[int] = set(ENTITY_DESC_EXT_MAP.keys())
+AGGREGATE_PARAM_MAP: dict[int, tuple[str, ...]] = {
+    # Electric Meter
+    3009: ("Power", "Current", "Voltage"),
+}
+AGGREGATE_WINDOW_MAP: dict[str, float] = {"1m": 60, "5m": 300}
+AGGREGATE_TYPES = ("mean", "min", "max")
+
+
+class AggregateEntityDescListResolver(EntityDescListResolver):
+    """Entity Description List Resolver of aggregate sensors."""
+
+    def _resolve_param_list(self, param_list: list[dict], device: VconnexDevice):
+        """Resolve aggregate entity descriptions of accepted params."""
+        aggregate_keys = AGGREGATE_PARAM_MAP.get(int(device.deviceTypeCode), ())
+        for description in super()._resolve_param_list(param_list, device):
+            if description.key not in aggregate_keys:
+                continue
+            name = (
+                description.name
+                if isinstance(description.name, str)
+                else description.key
+            )
+            for window_name, window in AGGREGATE_WINDOW_MAP.items():
+                for aggregate in AGGREGATE_TYPES:
+                    yield replace(
+                        description,
+                        key=f"{description.key}_{aggregate}_{window_name}",
+                        name=f"{name} ({aggregate} {window_name})",
+                        entity_registry_enabled_default=aggregate == "mean",
+                        min_write_interval=None,
+                        aggregate=aggregate,
+                        aggregate_window=window,
+                        source_key=description.key,
+                    )
+
+
+DEVICE_TYPE_SET = PLATFORM_DEVICE_TYPES[Platform.SENSOR]
 DEVICE_PARAM_TYPE_SET: set[int] = {ParamType.RAW_VALUE}
 ENTITY_DESC_RESOLVER = EntityDescResolver.of(
     SensorEntityDescriptionExt
 ).with_additional_param_func(append_entity_desc_ext)
 
 ENTITY_DESC_LIST_RESOLVER_LIST = [
-    EntityDescListResolver(DEVICE_TYPE_SET, DEVICE_PARAM_TYPE_SET, ENTITY_DESC_RESOLVER)
+    EntityDescListResolver(
+        DEVICE_TYPE_SET, DEVICE_PARAM_TYPE_SET, ENTITY_DESC_RESOLVER
+    ),
+    AggregateEntityDescListResolver(
+        set(AGGREGATE_PARAM_MAP.keys()), DEVICE_PARAM_TYPE_SET, ENTITY_DESC_RESOLVER
+    ),
 ]
 
 
 class VconnexSensorEntity(VconnexEntity, SensorEntity):
     """Vconnex Sensor Device."""
 
+    __slots__ = (
+        "value_converter",
+        "_written_value",
+        "_written_time",
+        "_unsub_trailing_write",
+    )
+
     def __init__(
         self,
         vconnex_device: VconnexDevice,
@@ -185,6 +258,10 @@ class VconnexSensorEntity(VconnexEntity, SensorEntity):
         else:
             self.value_converter = None
 
+        self._written_value: Any = None
+        self._written_time: float | None = None
+        self._unsub_trailing_write: CALLBACK_TYPE | None = None
+
     @property
     def native_value(self) -> StateType:
         """Get native value of sensor."""
@@ -199,25 +276,168 @@ class VconnexSensorEntity(VconnexEntity, SensorEntity):
         self, param, converter: Callable[[Any, VconnexEntity], Any] = None
     ) -> Any:
         """Get data of ExtendedDeviceData message."""
+        return self._get_message_data(
+            MessageName.EXTENDED_DEVICE_DATA, param, converter
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Call when entity will be removed."""
+        self._cancel_trailing_write()
+
+    @callback
+    def _on_device_updated(self, changed_params: set[str] | None = None) -> None:
+        """Write state of changed param, throttled if configured."""
+        if self.entity_description.min_write_interval is None:
+            super()._on_device_updated(changed_params)
+        elif changed_params is None or self.entity_description.key in changed_params:
+            self._throttled_write(changed_params is None)
+
+    @callback
+    def _throttled_write(self, force: bool = False) -> None:
+        """Write significant change now, others when write interval ends."""
+        interval = self.entity_description.min_write_interval
+        elapsed = (
+            time.monotonic() - self._written_time
+            if self._written_time is not None
+            else interval
+        )
+        if force or elapsed >= interval or self._is_significant(self.native_value):
+            self._write_now()
+        elif self._unsub_trailing_write is None:
+            self._unsub_trailing_write = async_call_later(
+                self.hass, interval - elapsed, self._trailing_write
+            )
+
+    @callback
+    def _trailing_write(self, _now) -> None:
+        """Write latest value at end of write interval."""
+        self._unsub_trailing_write = None
+        if self.native_value != self._written_value:
+            self._write_now()
+
+    @callback
+    def _write_now(self) -> None:
+        """Write state and remember written value."""
+        self._cancel_trailing_write()
+        self._written_value = self.native_value
+        self._written_time = time.monotonic()
+        self.async_write_ha_state()
+
+    @callback
+    def _cancel_trailing_write(self) -> None:
+        """Cancel scheduled trailing write."""
+        if self._unsub_trailing_write is not None:
+            self._unsub_trailing_write()
+            self._unsub_trailing_write = None
+
+    def _is_significant(self, value: Any) -> bool:
+        """Check if value differs enough from written value."""
+        try:
+            new_value = float(value)
+            old_value = float(self._written_value)
+        except (TypeError, ValueError):
+            return value != self._written_value
+
+        change = abs(new_value - old_value)
+        abs_threshold = self.entity_description.abs_change_threshold
+        rel_threshold = self.entity_description.rel_change_threshold
+        if abs_threshold is not None and change >= abs_threshold:
+            return True
+        if rel_threshold is not None and change > 0:
+            return old_value == 0 or change / abs(old_value) >= rel_threshold
+        return False
+
+
+class VconnexAggregateSensorEntity(VconnexSensorEntity):
+    """Vconnex Sensor of param aggregate over rolling window."""
+
+    __slots__ = ("_window",)
+
+    def __init__(
+        self,
+        vconnex_device: VconnexDevice,
+        device_manager: VconnexDeviceManagerExt,
+        description: SensorEntityDescriptionExt,
+    ) -> None:
+        """Create Vconnex Aggregate Sensor Entity object."""
+        super().__init__(
+            vconnex_device=vconnex_device,
+            device_manager=device_manager,
+            description=description,
+        )
+        self._window: RollingWindow | None = None
+
+    @property
+    def watched_params(self) -> set[str]:
+        """Get params which state of entity depends on, state is refreshed."""
+        return set()
+
+    @property
+    def native_value(self) -> StateType:
+        """Get aggregate value of window."""
+        if self._window is None:
+            return None
+        value = getattr(self._window, self.entity_description.aggregate)(
+            time.monotonic()
+        )
+        return round(value, 3) if value is not None else None
+
+    async def async_added_to_hass(self) -> None:
+        """Call when entity is added."""
+        await super().async_added_to_hass()
+        description = self.entity_description
+        self._window = self.device_manager.windows.acquire(
+            self.vconnex_device.deviceId,
+            description.source_key,
+            description.aggregate_window,
+        )
         try:
-            data_dict = self._get_device_data("ExtendedDeviceData")
-            if data_dict is not None and "devV" in data_dict:
-                d_values = data_dict.get("devV")
-                for d_value in d_values:
-                    if d_value.get("param") == param:
-                        param_value = d_value.get("value")
-                        return (
-                            param_value
-                            if converter is None
-                            else converter(param_value, self)
-                        )
-        except Exception:  # pylint: disable=broad-except
-            LOGGER.exception("Something went wrong!!!")
+            self._window.add(
+                time.monotonic(), float(self.get_data(description.source_key))
+            )
+        except (TypeError, ValueError):
+            pass
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_refresh, AGGREGATE_REFRESH_INTERVAL
+            )
+        )
+
+    @callback
+    def _async_refresh(self, _now=None) -> None:
+        """Write aggregate value of window."""
+        self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Call when entity will be removed."""
+        await super().async_will_remove_from_hass()
+        self._window = None
+        self.device_manager.windows.release(
+            self.vconnex_device.deviceId,
+            self.entity_description.source_key,
+            self.entity_description.aggregate_window,
+        )
 
-        return None
 
+def create_sensor_entity(
+    vconnex_device: VconnexDevice,
+    device_manager: VconnexDeviceManagerExt,
+    description: SensorEntityDescriptionExt,
+) -> VconnexSensorEntity:
+    """Create sensor entity of description."""
+    entity_class = (
+        VconnexAggregateSensorEntity
+        if description.aggregate is not None
+        else VconnexSensorEntity
+    )
+    return entity_class(
+        vconnex_device=vconnex_device,
+        device_manager=device_manager,
+        description=description,
+    )
 
-TargetEntity = VconnexSensorEntity
+
+TargetEntity = create_sensor_entity
 
 
 async def async_setup_entry(
@@ -225,26 +445,6 @@ async def async_setup_entry(
 ) -> None:
     """Async setup Home Assistant entry."""
     vconnex_data: HomeAssistantVconnexData = hass.data[DOMAIN][entry.entry_id]
-    device_manager = vconnex_data.device_manager
-
-    @callback
-    def on_device_added(device_ids: list[str]) -> None:
-        """Device added callback."""
-        entities: list[Entity] = []
-        for device_id in device_ids:
-            device = device_manager.device_map[device_id]
-            for description_list_resolver in ENTITY_DESC_LIST_RESOLVER_LIST:
-                description_list = description_list_resolver.from_device(device)
-                if len(description_list) > 0:
-                    for description in description_list:
-                        entities.append(
-                            TargetEntity(
-                                vconnex_device=device,
-                                device_manager=device_manager,
-                                description=description,
-                            )
-                        )
-        async_add_entities(entities)
-
-    async_dispatcher_connect(hass, DispatcherSignal.DEVICE_ADDED, on_device_added)
-    on_device_added(device_ids=device_manager.device_map.keys())
+    vconnex_data.entity_builder.async_register_platform(
+        SENSOR_DOMAIN, ENTITY_DESC_LIST_RESOLVER_LIST, TargetEntity, async_add_entities
+    )
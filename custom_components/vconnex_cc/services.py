@@ -0,0 +1,158 @@
+"""Services of Vconnex integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from vconnex.api import ReturnCode
+import voluptuous as vol
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+import homeassistant.helpers.config_validation as cv
+
+from .const import DOMAIN, SERVICE_SET_MANY, CommandName
+from .entity import VconnexEntity
+from .vconnex_wrap import HomeAssistantVconnexData, VconnexDeviceManagerExt
+
+LOGGER = logging.getLogger(__name__)
+
+ATTR_TARGETS = "targets"
+ATTR_VALUE = "value"
+ATTR_WAIT_FOR_ACK = "wait_for_ack"
+
+SET_MANY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_TARGETS): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {
+                        vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+                        vol.Required(ATTR_VALUE): vol.Any(bool, int, float, str),
+                    }
+                )
+            ],
+        ),
+        vol.Optional(ATTR_WAIT_FOR_ACK, default=False): cv.boolean,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register services of integration once."""
+    if hass.services.has_service(DOMAIN, SERVICE_SET_MANY):
+        return
+
+    async def async_set_many(call: ServiceCall) -> ServiceResponse:
+        return await async_handle_set_many(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_MANY,
+        async_set_many,
+        schema=SET_MANY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove services of integration when no entry is loaded."""
+    if not hass.data.get(DOMAIN):
+        hass.services.async_remove(DOMAIN, SERVICE_SET_MANY)
+
+
+def _find_entity(hass: HomeAssistant, entity_id: str) -> VconnexEntity | None:
+    """Find loaded Vconnex entity by entity id."""
+    vconnex_data: HomeAssistantVconnexData
+    for vconnex_data in hass.data.get(DOMAIN, {}).values():
+        if (entity := vconnex_data.device_manager.entities.get(entity_id)) is not None:
+            return entity
+    return None
+
+
+async def async_handle_set_many(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Set values of many entities with one merged command per device.
+
+    Targets are grouped by device and their params are merged, the merged
+    commands are sent through the command batcher of each device manager.
+    """
+    results: dict[str, dict[str, Any]] = {}
+    groups: dict[
+        tuple[int, str], tuple[VconnexDeviceManagerExt, dict[str, Any], list[str]]
+    ] = {}
+    for target in call.data[ATTR_TARGETS]:
+        entity_id = target[ATTR_ENTITY_ID]
+        if (entity := _find_entity(hass, entity_id)) is None:
+            results[entity_id] = {"result": "not_found"}
+            continue
+        try:
+            values = entity.get_command_values(target[ATTR_VALUE])
+        except (vol.Invalid, TypeError, ValueError):
+            results[entity_id] = {"result": "invalid_value"}
+            continue
+        if values is None:
+            results[entity_id] = {"result": "not_supported"}
+            continue
+
+        device_manager = entity.device_manager
+        group_key = (id(device_manager), entity.vconnex_device.deviceId)
+        if (group := groups.get(group_key)) is None:
+            group = groups[group_key] = (device_manager, {}, [])
+        group[1].update(values)
+        group[2].append(entity_id)
+
+    wait_for_ack = call.data[ATTR_WAIT_FOR_ACK]
+    queued_list = [
+        (
+            entity_ids,
+            device_manager.command_batcher.async_enqueue(
+                device_id,
+                CommandName.SET_DATA,
+                values,
+                expect_ack=wait_for_ack,
+            ),
+        )
+        for (_, device_id), (device_manager, values, entity_ids) in groups.items()
+    ]
+    LOGGER.debug(
+        "Set many: %d targets in %d device commands",
+        len(call.data[ATTR_TARGETS]),
+        len(queued_list),
+    )
+
+    result_codes = await asyncio.gather(
+        *(queued.result for _, queued in queued_list)
+    )
+    acks = (
+        await asyncio.gather(
+            *(queued.ack for _, queued in queued_list), return_exceptions=True
+        )
+        if wait_for_ack
+        else [None] * len(queued_list)
+    )
+    for (entity_ids, _), result_code, ack in zip(
+        queued_list, result_codes, acks, strict=True
+    ):
+        result: dict[str, Any] = {
+            "result": "ok" if result_code == ReturnCode.SUCCESS else "error"
+        }
+        if wait_for_ack:
+            result["confirmed"] = ack is True
+        for entity_id in entity_ids:
+            results[entity_id] = result
+
+    if not call.return_response:
+        return None
+    return {"results": results}
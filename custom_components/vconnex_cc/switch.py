@@ -8,23 +8,25 @@ from typing import Any
 from vconnex.device import VconnexDevice, VconnexDeviceManager
 
 from homeassistant.components.switch import (
+    DOMAIN as SWITCH_DOMAIN,
     DEVICE_CLASS_SWITCH,
     SwitchEntity,
     SwitchEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, CommandName, DispatcherSignal, ParamType
+from .const import DOMAIN, PLATFORM_DEVICE_TYPES, ParamType
 from .entity import EntityDescListResolver, EntityDescResolver, VconnexEntity
 from .vconnex_wrap import HomeAssistantVconnexData
 
 logger = logging.getLogger(__name__)
 
 
-DEVICE_TYPE_SET = {3010, 3011, 3012, 3015, 3016, 3017, 3018, 3043, 3052}
+DEVICE_TYPE_SET = PLATFORM_DEVICE_TYPES[Platform.SWITCH]
 DEVICE_PARAM_TYPE_SET = {ParamType.ON_OFF}
 ENTITY_DESC_RESOLVER = EntityDescResolver.of(
     SwitchEntityDescription
@@ -38,6 +40,8 @@ ENTITY_DESC_LIST_RESOLVER_LIST = [
 class VconnexSwitchEntity(VconnexEntity, SwitchEntity):
     """Vconnex Switch Device."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         vconnex_device: VconnexDevice,
@@ -60,13 +64,17 @@ class VconnexSwitchEntity(VconnexEntity, SwitchEntity):
             param=self.entity_description.key, converter=lambda val, entity: val != 0
         )
 
-    def turn_on(self, **kwargs: Any) -> None:
+    def get_command_values(self, value: Any) -> dict[str, Any] | None:
+        """Get CmdSetData values which turn switch on or off."""
+        return {self.entity_description.key: 1 if cv.boolean(value) else 0}
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
-        self._send_command("CmdSetData", {self.entity_description.key: 1})
+        await self._async_set_data({self.entity_description.key: 1}, optimistic=True)
 
-    def turn_off(self, **kwargs: Any) -> None:
+    async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
-        self._send_command(CommandName.SET_DATA, {self.entity_description.key: 0})
+        await self._async_set_data({self.entity_description.key: 0}, optimistic=True)
 
 
 TargetEntity = VconnexSwitchEntity
@@ -77,29 +85,6 @@ async def async_setup_entry(
 ) -> None:
     """Async setup Home Assistant entry."""
     vconnex_data: HomeAssistantVconnexData = hass.data[DOMAIN][entry.entry_id]
-    device_manager = vconnex_data.device_manager
-
-    @callback
-    def on_device_added(
-        device_ids: list[str],
-    ) -> None:
-        """Device added callback."""
-        entities: list[VconnexEntity] = []
-        for device_id in device_ids:
-            device = device_manager.device_map.get(device_id)
-            if device is not None:
-                for description_list_resolver in ENTITY_DESC_LIST_RESOLVER_LIST:
-                    description_list = description_list_resolver.from_device(device)
-                    if len(description_list) > 0:
-                        for description in description_list:
-                            entities.append(
-                                TargetEntity(
-                                    vconnex_device=device,
-                                    device_manager=device_manager,
-                                    description=description,
-                                )
-                            )
-        async_add_entities(entities)
-
-    async_dispatcher_connect(hass, DispatcherSignal.DEVICE_ADDED, on_device_added)
-    on_device_added(device_ids=device_manager.device_map.keys())
+    vconnex_data.entity_builder.async_register_platform(
+        SWITCH_DOMAIN, ENTITY_DESC_LIST_RESOLVER_LIST, TargetEntity, async_add_entities
+    )
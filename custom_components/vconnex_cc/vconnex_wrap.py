@@ -1,118 +1,2089 @@
 """The Vconnex wrap."""
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+import copy
+from datetime import timedelta
+from functools import partial
+import hashlib
 import logging
+import random
+import sys
+import threading
+import time
+from types import MappingProxyType
 from typing import Any, NamedTuple
 
-from vconnex.api import VconnexAPI
+import aiohttp
+from vconnex.api import ApiResponse, ReturnCode, TokenInfo, VconnexAPI
 from vconnex.device import VconnexDevice, VconnexDeviceListener, VconnexDeviceManager
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry
-from homeassistant.helpers.dispatcher import dispatcher_send
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+    dispatcher_send,
+)
+from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
 
+from .aggregate import RollingWindowRegistry
 from .const import (
+    CONF_ACK_TIMEOUT,
+    CONF_AVAILABILITY_TIMEOUT,
     CONF_CLIENT_ID,
     CONF_CLIENT_SECRET,
+    CONF_COMMAND_WINDOW,
+    CONF_OPTIMISTIC,
+    CONF_POLL_RATE,
+    CONF_STALE_AFTER,
+    CONF_WARMUP_TIMEOUT,
+    CONF_WARMUP_WORKERS,
+    CONTROLLABLE_DEVICE_TYPES,
+    DEFAULT_ACK_TIMEOUT,
+    DEFAULT_AVAILABILITY_TIMEOUT,
+    DEFAULT_COMMAND_WINDOW,
     DEFAULT_ENDPOINT,
+    DEFAULT_POLL_RATE,
+    DEFAULT_STALE_AFTER,
+    DEFAULT_WARMUP_TIMEOUT,
+    DEFAULT_WARMUP_WORKERS,
     DOMAIN,
+    DOMAIN_NAME,
+    PLATFORM_DEVICE_TYPES,
+    PLATFORMS,
     PROJECT_CODE,
     CommandName,
     DispatcherSignal,
+    MessageName,
 )
+from .metrics import MetricRegistry
 
 LOGGER = logging.getLogger(__name__)
 
+INDEXED_MESSAGE_NAMES = (MessageName.GET_DATA, MessageName.EXTENDED_DEVICE_DATA)
+MESSAGE_SLOTS = {name: slot for slot, name in enumerate(INDEXED_MESSAGE_NAMES)}
+EMPTY_VALUES: Mapping[str, Any] = MappingProxyType({})
+
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 30
+TOKEN_STORAGE_VERSION = 1
+TOKEN_SAVE_DELAY = 1
+
+DATA_TRANSPORT_MANAGER = f"{DOMAIN}_transport_manager"
+
+PUSH_QUEUE_MAX_SIZE = 1000
+PUSH_BACKPRESSURE_TIMEOUT = 1
+
+STALE_SCAN_INTERVAL = timedelta(seconds=30)
+AVAILABILITY_CHECK_INTERVAL = timedelta(seconds=30)
+
+PUSH_CHECK_INTERVAL = timedelta(seconds=10)
+PUSH_BACKOFF_BASE = 5
+PUSH_BACKOFF_MAX = 300
+PUSH_SELF_RECOVERY_TIME = 60  # seconds the MQTT client loop reconnects alone
+
+CONNECT_RETRY_BASE = 30
+CONNECT_RETRY_MAX = 600
+
+ENTITY_CHUNK_SIZE = 100
+LOOP_LAG_SAMPLE_INTERVAL = 0.05
+ENTITY_ADD_SETTLE_TIME = 1  # seconds without registered entities ending startup
+
+API_TOKEN_PATH = "/auth/project-token"
+API_DEVICES_PATH = "/devices"
+API_ACCESS_CONFIG_PATH = "/access-config"
+API_COMMANDS_PATH = "/commands/execute"
+API_REQUEST_TIMEOUT = 15
+TOKEN_REFRESH_MARGIN = 120
+TOKEN_REJECTED_STATUSES = (401, 403)
+
+
+class TokenRejectedError(Exception):
+    """Token is rejected by API."""
+
+
+class VconnexAsyncApi:
+    """Async client of Vconnex API using shared aiohttp session.
+
+    Credentials and token are shared with the wrapped SDK api object, so the SDK
+    does not request its own token.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: VconnexAPI,
+        on_token_updated: Callable[[TokenInfo | None], None] | None = None,
+    ) -> None:
+        """Create Vconnex Async Api object."""
+        self.api = api
+        self.metrics = MetricRegistry()
+        self._session = async_get_clientsession(hass)
+        self._token_lock = asyncio.Lock()
+        self._on_token_updated = on_token_updated
+
+    async def async_get_token_info(self) -> TokenInfo | None:
+        """Get exist token or retrieve new one."""
+        async with self._token_lock:
+            token_info = self.api.token_info
+            if token_info is None or token_info.expire_time < (
+                (int(time.time()) + TOKEN_REFRESH_MARGIN) * 1000
+            ):
+                token_info = None
+                self.metrics.counter("token_request").inc()
+                try:
+                    resp = await self._async_request(
+                        "POST",
+                        API_TOKEN_PATH,
+                        body={
+                            "clientId": self.api.client_id,
+                            "clientSecret": self.api.client_secret,
+                            "projectCode": self.api.project_code,
+                        },
+                    )
+                    if resp is not None and resp.code == ReturnCode.SUCCESS:
+                        token_info = TokenInfo(resp.data)
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    LOGGER.exception("Error while request token.")
+                self.api.token_info = token_info
+                if self._on_token_updated is not None:
+                    self._on_token_updated(token_info)
+
+        return token_info
+
+    async def async_is_valid(self) -> bool:
+        """Validate credentials."""
+        return await self.async_get_token_info() is not None
+
+    async def async_get_token_data(self) -> dict[str, Any] | None:
+        """Get token data."""
+        token_info = await self.async_get_token_info()
+        return token_info.data if token_info is not None else None
+
+    async def async_get(
+        self, path: str, params: dict[str, Any] | None = None
+    ) -> ApiResponse | None:
+        """Get request."""
+        return await self._async_authorized_request("GET", path, params=params)
+
+    async def async_post(
+        self, path: str, body: dict[str, Any] | None = None
+    ) -> ApiResponse | None:
+        """Post request."""
+        return await self._async_authorized_request("POST", path, body=body)
+
+    async def _async_authorized_request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        body: dict[str, Any] | None = None,
+    ) -> ApiResponse | None:
+        """Request with token, retry once with new token if it is rejected."""
+        for is_retry in (False, True):
+            if (token_info := await self.async_get_token_info()) is None:
+                LOGGER.error("Unauthorized request")
+                return None
+
+            headers = {
+                "X-Authorization": token_info.token,
+                "sign": "",
+                "lang": self.api.lang,
+            }
+            try:
+                return await self._async_request(
+                    method, path, params, body, headers, check_token=True
+                )
+            except TokenRejectedError:
+                if is_retry:
+                    LOGGER.error("Token is rejected after re-authentication")
+                    return None
+                await self._async_invalidate_token(token_info)
+        return None
+
+    async def _async_invalidate_token(self, token_info: TokenInfo) -> None:
+        """Drop token rejected by API, unless it is already renewed."""
+        async with self._token_lock:
+            if self.api.token_info is not token_info:
+                return
+            LOGGER.warning("Token is rejected, re-authenticate")
+            self.metrics.counter("token_rejected").inc()
+            self.api.token_info = None
+            if self._on_token_updated is not None:
+                self._on_token_updated(None)
+
+    async def _async_request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        body: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        check_token: bool = False,
+    ) -> ApiResponse | None:
+        """Request base.
+
+        If check_token is set, TokenRejectedError is raised when the API rejects
+        the token of request.
+        """
+        LOGGER.debug(
+            "Request: method=%s, url=%s, params=%s",
+            method,
+            self.api.endpoint + path,
+            params,
+        )
+        self.metrics.counter("http_request").inc()
+        start_time = time.monotonic()
+        try:
+            async with self._session.request(
+                method,
+                self.api.endpoint + path,
+                params=params,
+                json=body,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=API_REQUEST_TIMEOUT),
+            ) as response:
+                if check_token and response.status in TOKEN_REJECTED_STATUSES:
+                    self.metrics.counter("http_error").inc()
+                    raise TokenRejectedError
+                if not response.ok:
+                    self.metrics.counter("http_error").inc()
+                    LOGGER.error(
+                        "Response error: code=%d, body=%s",
+                        response.status,
+                        await response.text(),
+                    )
+                    return None
+
+                try:
+                    return ApiResponse(**await response.json(content_type=None))
+                except (TypeError, ValueError):
+                    self.metrics.counter("http_error").inc()
+                    LOGGER.error(
+                        "Response error: invalid body=%s", await response.text()
+                    )
+                    return None
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.metrics.counter("http_error").inc()
+            raise
+        finally:
+            self.metrics.latency("http_request_latency").record(
+                time.monotonic() - start_time
+            )
+
+
+class VconnexTransportManager:
+    """Process wide transport of all config entries.
+
+    API clients are kept by client id with a persistent token cache, so config
+    flow, setup and reloads of the same project reuse one client and its token.
+    Requests of all entries are multiplexed over the pooled keep-alive
+    connections of the shared aiohttp session. Push connections stay one per
+    entry, their credentials are issued per project. Resource use is counted
+    per entry.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Create Vconnex Transport Manager object."""
+        self.hass = hass
+        self._apis: dict[str, VconnexAsyncApi] = {}
+        self._entry_client_ids: dict[str, str] = {}
+        self._store = Store(hass, TOKEN_STORAGE_VERSION, f"{DOMAIN}.tokens")
+        self._tokens: dict[str, dict[str, Any]] | None = None
+        self._load_lock = asyncio.Lock()
+
+    async def async_get_api(
+        self, client_id: str, client_secret: str
+    ) -> VconnexAsyncApi:
+        """Get API client of credentials."""
+        await self._async_load_tokens()
+        api = self._apis.get(client_id)
+        if api is not None and api.api.client_secret == client_secret:
+            return api
+
+        secret_hash = self._hash_secret(client_secret)
+        sync_api = VconnexAPI(
+            endpoint=DEFAULT_ENDPOINT,
+            client_id=client_id,
+            client_secret=client_secret,
+            project_code=PROJECT_CODE,
+        )
+        if (token := self._tokens.get(client_id)) is not None and (
+            token.get("secretHash") == secret_hash
+        ):
+            sync_api.token_info = TokenInfo(token)
+
+        api = VconnexAsyncApi(
+            self.hass,
+            sync_api,
+            on_token_updated=partial(self._on_token_updated, client_id, secret_hash),
+        )
+        self._apis[client_id] = api
+        return api
+
+    async def async_acquire(
+        self, entry_id: str, client_id: str, client_secret: str
+    ) -> VconnexAsyncApi:
+        """Get API client of config entry."""
+        api = await self.async_get_api(client_id, client_secret)
+        self._entry_client_ids[entry_id] = client_id
+        return api
+
+    @callback
+    def async_release(self, entry_id: str) -> None:
+        """Release config entry, its API client is kept for reload."""
+        self._entry_client_ids.pop(entry_id, None)
+
+    def get_entry_usage(self, entry_id: str) -> dict[str, Any]:
+        """Get resource use of config entry."""
+        client_id = self._entry_client_ids.get(entry_id)
+        if client_id is None or (api := self._apis.get(client_id)) is None:
+            return {}
+        return {
+            "active_entries": len(self._entry_client_ids),
+            "metrics": api.metrics.as_dict(),
+        }
+
+    async def async_remove_api(self, client_id: str) -> None:
+        """Remove API client and saved token of client id."""
+        await self._async_load_tokens()
+        self._apis.pop(client_id, None)
+        if self._tokens.pop(client_id, None) is not None:
+            self._store.async_delay_save(self._data_to_save, TOKEN_SAVE_DELAY)
+
+    async def _async_load_tokens(self) -> None:
+        """Load saved tokens once."""
+        async with self._load_lock:
+            if self._tokens is None:
+                data = await self._store.async_load()
+                self._tokens = dict((data or {}).get("tokens", {}))
+
+    @callback
+    def _on_token_updated(
+        self, client_id: str, secret_hash: str, token_info: TokenInfo | None
+    ) -> None:
+        """Save updated token."""
+        if token_info is None:
+            self._tokens.pop(client_id, None)
+        else:
+            self._tokens[client_id] = {
+                "secretHash": secret_hash,
+                "token": token_info.token,
+                "expireTime": token_info.expire_time,
+                "data": token_info.data,
+            }
+        self._store.async_delay_save(self._data_to_save, TOKEN_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Get token store data."""
+        return {"tokens": self._tokens}
+
+    @staticmethod
+    def _hash_secret(client_secret: str) -> str:
+        return hashlib.sha256(client_secret.encode("utf8")).hexdigest()
+
+
+@callback
+def async_get_transport_manager(hass: HomeAssistant) -> VconnexTransportManager:
+    """Get transport manager of Home Assistant instance."""
+    if (manager := hass.data.get(DATA_TRANSPORT_MANAGER)) is None:
+        manager = hass.data[DATA_TRANSPORT_MANAGER] = VconnexTransportManager(hass)
+    return manager
+
+
+class DeviceDataState:
+    """Indexed data messages of device, one slot per indexed message name."""
+
+    __slots__ = ("messages", "values")
+
+    def __init__(self) -> None:
+        """Create Device Data State object."""
+        self.messages: list[dict | None] = [None] * len(INDEXED_MESSAGE_NAMES)
+        self.values: list[Mapping[str, Any]] = [EMPTY_VALUES] * len(
+            INDEXED_MESSAGE_NAMES
+        )
+
+
+class DeviceDataIndex:
+    """Param value index of device data messages.
+
+    The index of a message is built once per received payload and shared by all
+    entities of the device. Param keys are interned, so devices of the same
+    type share their key strings.
+    """
+
+    def __init__(self) -> None:
+        """Create Device Data Index object."""
+        self._index: dict[str, DeviceDataState] = {}
+
+    def update(self, device: VconnexDevice) -> set[str] | None:
+        """Index latest data messages of device.
+
+        Return set of changed params, or None if all params should be considered
+        changed (first data of device).
+        """
+        if (state := self._index.get(device.deviceId)) is None:
+            state = self._index[device.deviceId] = DeviceDataState()
+        is_first_data = all(message is None for message in state.messages)
+
+        changed_params: set[str] = set()
+        for slot, message_name in enumerate(INDEXED_MESSAGE_NAMES):
+            message = device.data.get(message_name)
+            if message is state.messages[slot]:
+                continue
+
+            old_values = state.values[slot]
+            new_values = {}
+            if message is not None and (d_values := message.get("devV")) is not None:
+                for d_value in d_values:
+                    param = d_value.get("param")
+                    if isinstance(param, str):
+                        param = sys.intern(param)
+                    new_values[param] = d_value.get("value")
+            state.messages[slot] = message
+            state.values[slot] = new_values or EMPTY_VALUES
+
+            changed_params.update(
+                param
+                for param, value in new_values.items()
+                if param not in old_values or old_values[param] != value
+            )
+            changed_params.update(old_values.keys() - new_values.keys())
+
+        return None if is_first_data else changed_params
+
+    def remove(self, device_id: str) -> None:
+        """Remove index of device."""
+        self._index.pop(device_id, None)
+
+    def get_values(
+        self, device: VconnexDevice, message_name: str
+    ) -> Mapping[str, Any]:
+        """Get param value dict of last indexed device data message, read only."""
+        if (state := self._index.get(device.deviceId)) is not None and (
+            slot := MESSAGE_SLOTS.get(message_name)
+        ) is not None:
+            return state.values[slot]
+        return EMPTY_VALUES
+
+
+class PushIngestQueue:
+    """Thread-safe queue of device updates pushed by the SDK.
+
+    Pushes are processed on the event loop in one scheduled batch per loop
+    iteration, a newer push of a device supersedes its queued one. Producer
+    threads are blocked for a while when the queue is full.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        device_manager: VconnexDeviceManagerExt,
+        max_size: int = PUSH_QUEUE_MAX_SIZE,
+    ) -> None:
+        """Create Push Ingest Queue object."""
+        self.hass = hass
+        self.device_manager = device_manager
+        self.max_size = max_size
+        self._condition = threading.Condition()
+        self._queue: dict[str, tuple[float, bool]] = {}
+        self._scheduled = False
+        self._signals: dict[str, str] = {}
+
+    def put(self, device_id: str, all_changed: bool = False) -> None:
+        """Queue device update, called from SDK threads or the event loop.
+
+        Only SDK threads wait for free space, the event loop which drains the
+        queue is never blocked.
+        """
+        metrics = self.device_manager.metrics
+        with self._condition:
+            if (
+                len(self._queue) >= self.max_size
+                and device_id not in self._queue
+                and not self._in_event_loop()
+            ):
+                metrics.counter("push_backpressure").inc()
+                self._condition.wait_for(
+                    lambda: len(self._queue) < self.max_size,
+                    PUSH_BACKPRESSURE_TIMEOUT,
+                )
+
+            if (queued := self._queue.get(device_id)) is not None:
+                metrics.counter("push_superseded").inc()
+                self._queue[device_id] = (queued[0], queued[1] or all_changed)
+            else:
+                self._queue[device_id] = (time.monotonic(), all_changed)
+
+            if not self._scheduled:
+                self._scheduled = True
+                self.hass.loop.call_soon_threadsafe(self._process)
+
+    def _in_event_loop(self) -> bool:
+        """Check if caller runs in the event loop."""
+        try:
+            return asyncio.get_running_loop() is self.hass.loop
+        except RuntimeError:
+            return False
+
+    @callback
+    def _process(self) -> None:
+        """Process queued device updates."""
+        with self._condition:
+            batch, self._queue = self._queue, {}
+            self._scheduled = False
+            self._condition.notify_all()
+
+        now = time.monotonic()
+        metrics = self.device_manager.metrics
+        metrics.stat("push_batch_size").record(len(batch))
+        queue_delay = metrics.latency("push_queue_delay")
+
+        device_manager = self.device_manager
+        for device_id, (queued_time, all_changed) in batch.items():
+            queue_delay.record(now - queued_time)
+            if (device := device_manager.device_map.get(device_id)) is None:
+                continue
+
+            became_available = device_manager.availability.async_seen(device_id, now)
+            changed_params = device_manager.data_index.update(device)
+            if device_id in device_manager.windows:
+                device_manager.windows.add_samples(
+                    device_id,
+                    device_manager.data_index.get_values(device, MessageName.GET_DATA),
+                    now,
+                )
+            # A push may confirm a command whose value the device already had
+            device_manager.ack_tracker.async_check(
+                device_id,
+                device_manager.data_index.get_values(device, MessageName.GET_DATA),
+            )
+            if all_changed or became_available:
+                changed_params = None
+            if changed_params is not None and len(changed_params) == 0:
+                continue
+
+            if (signal := self._signals.get(device_id)) is None:
+                signal = self._signals[
+                    device_id
+                ] = f"{DispatcherSignal.DEVICE_UPDATED}.{device_id}"
+            async_dispatcher_send(self.hass, signal, changed_params)
+
+
+class DeviceAvailability:
+    """Availability of devices by time since they were last seen.
+
+    Devices are seen by pushed data, which also confirms command acks. A single
+    timer checks all devices and marks expired ones unavailable together.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        device_manager: VconnexDeviceManagerExt,
+        timeout: float,
+    ) -> None:
+        """Create Device Availability object."""
+        self.hass = hass
+        self.device_manager = device_manager
+        self.timeout = timeout
+        self._start_time = time.monotonic()
+        self._unavailable: set[str] = set()
+
+    def is_available(self, device_id: str) -> bool:
+        """Check if device is available."""
+        return device_id not in self._unavailable
+
+    @callback
+    def async_seen(self, device_id: str, now: float) -> bool:
+        """Mark device seen, return True if it was unavailable."""
+        self.device_manager.last_seen[device_id] = now
+        if device_id in self._unavailable:
+            self._unavailable.discard(device_id)
+            return True
+        return False
+
+    @callback
+    def async_forget(self, device_id: str) -> None:
+        """Forget removed device."""
+        self.device_manager.last_seen.pop(device_id, None)
+        self._unavailable.discard(device_id)
+
+    @callback
+    def async_mark_unavailable(self, device_ids: Iterable[str]) -> None:
+        """Mark devices unavailable until they are seen again."""
+        device_ids = [
+            device_id for device_id in device_ids if device_id not in self._unavailable
+        ]
+        self._unavailable.update(device_ids)
+        for device_id in device_ids:
+            async_dispatcher_send(
+                self.hass, f"{DispatcherSignal.DEVICE_UPDATED}.{device_id}", None
+            )
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Start checking availability, return stop function."""
+        self._start_time = time.monotonic()
+        return async_track_time_interval(
+            self.hass, self._async_check, AVAILABILITY_CHECK_INTERVAL
+        )
+
+    @callback
+    def _async_check(self, _now=None) -> None:
+        """Mark devices which are not seen within timeout unavailable."""
+        if self.timeout <= 0:
+            # Disabled by options
+            restored_device_ids, self._unavailable = self._unavailable, set()
+            for device_id in restored_device_ids:
+                async_dispatcher_send(
+                    self.hass, f"{DispatcherSignal.DEVICE_UPDATED}.{device_id}", None
+                )
+            return
+
+        expire_time = time.monotonic() - self.timeout
+        if self._start_time > expire_time:
+            return
+
+        last_seen = self.device_manager.last_seen
+        expired_device_ids = [
+            device_id
+            for device_id in self.device_manager.device_map
+            if device_id not in self._unavailable
+            and last_seen.get(device_id, self._start_time) < expire_time
+        ]
+        if not expired_device_ids:
+            return
+
+        LOGGER.debug("Mark %d devices unavailable", len(expired_device_ids))
+        self.async_mark_unavailable(expired_device_ids)
+
+
+class PendingAck(NamedTuple):
+    """Command values waiting for acknowledgement."""
+
+    values: dict[str, Any]
+    sent_time: float
+    future: asyncio.Future
+
+
+class CommandAckTracker:
+    """Track acknowledgement of commands by confirming device data."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        metrics: MetricRegistry,
+        timeout: float = DEFAULT_ACK_TIMEOUT,
+    ) -> None:
+        """Create Command Ack Tracker object."""
+        self.hass = hass
+        self.metrics = metrics
+        self.timeout = timeout
+        self._pending: dict[str, list[PendingAck]] = {}
+
+    @callback
+    def async_expect(self, device_id: str, values: dict[str, Any]) -> asyncio.Future:
+        """Expect device data to confirm values.
+
+        The returned future is resolved with True when all values are confirmed or
+        with False on timeout.
+        """
+        pending = PendingAck(
+            dict(values), time.monotonic(), self.hass.loop.create_future()
+        )
+        self._pending.setdefault(device_id, []).append(pending)
+        timer = self.hass.loop.call_later(
+            self.timeout, self._resolve, pending, False
+        )
+        pending.future.add_done_callback(
+            lambda _: self._discard(device_id, pending, timer)
+        )
+        return pending.future
+
+    @callback
+    def async_check(
+        self, device_id: str, param_values: Mapping[str, Any]
+    ) -> None:
+        """Resolve pending acknowledgements confirmed by param values."""
+        for pending in list(self._pending.get(device_id, ())):
+            if all(
+                param in param_values and param_values[param] == value
+                for param, value in pending.values.items()
+            ):
+                self._resolve(pending, True)
+
+    @callback
+    def _resolve(self, pending: PendingAck, confirmed: bool) -> None:
+        """Resolve pending acknowledgement."""
+        if pending.future.done():
+            return
+
+        if confirmed:
+            self.metrics.latency("command_ack_latency").record(
+                time.monotonic() - pending.sent_time
+            )
+        else:
+            self.metrics.counter("command_ack_timeout").inc()
+        pending.future.set_result(confirmed)
+
+    @callback
+    def _discard(
+        self, device_id: str, pending: PendingAck, timer: asyncio.TimerHandle
+    ) -> None:
+        """Discard done pending acknowledgement."""
+        timer.cancel()
+        if (device_pending := self._pending.get(device_id)) is not None:
+            if pending in device_pending:
+                device_pending.remove(pending)
+            if len(device_pending) == 0:
+                self._pending.pop(device_id, None)
+
+
+class PendingCommand(NamedTuple):
+    """Merged command waiting to be sent."""
+
+    values: dict[str, Any]
+    futures: list[asyncio.Future]
+    queued_time: float
+
+
+class QueuedCommand(NamedTuple):
+    """Futures of queued command.
+
+    The result future is resolved with the result code of the request, the ack
+    future with True when device data confirms the values or False on timeout.
+    """
+
+    result: asyncio.Future
+    ack: asyncio.Future | None
+
+
+class CommandBatcher:
+    """Queue device commands and send them in batches.
+
+    Commands of a device are coalesced during a short window opened by its first
+    pending command, values of the same command are merged with last write wins.
+    Devices whose windows close in the same event loop iteration form one batch.
+    The cloud API executes one device command per request, so the requests of a
+    batch are pipelined over the pooled keep-alive session of the API client.
+    Requests of a device are sent in order through its own lane, requests of
+    different devices run in parallel, bounded by one limit shared by all
+    batches.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        device_manager: VconnexDeviceManagerExt,
+        max_parallel: int = DEFAULT_WARMUP_WORKERS,
+        window: float = DEFAULT_COMMAND_WINDOW / 1000,
+    ) -> None:
+        """Create Command Batcher object."""
+        self.hass = hass
+        self.device_manager = device_manager
+        self.window = window
+        self._max_parallel = max_parallel
+        self._semaphore = asyncio.Semaphore(max_parallel)
+        self._pending: dict[str, dict[str, PendingCommand]] = {}
+        self._ready: dict[tuple[str, str], PendingCommand] = {}
+        self._flush_scheduled = False
+        self._lanes: dict[str, asyncio.Lock] = {}
+        self._lane_users: dict[str, int] = {}
+        self._queued = 0
+
+    @property
+    def max_parallel(self) -> int:
+        """Get max number of parallel requests."""
+        return self._max_parallel
+
+    @max_parallel.setter
+    def max_parallel(self, max_parallel: int) -> None:
+        """Set max number of parallel requests, running requests are kept."""
+        if max_parallel != self._max_parallel:
+            self._max_parallel = max_parallel
+            self._semaphore = asyncio.Semaphore(max_parallel)
+
+    @property
+    def queue_depth(self) -> int:
+        """Get number of queued commands which are not sent yet."""
+        return self._queued
+
+    @callback
+    def async_enqueue(
+        self,
+        device_id: str,
+        command: str,
+        values: dict[str, Any],
+        expect_ack: bool = False,
+    ) -> QueuedCommand:
+        """Queue command of device without waiting for it."""
+        ack = (
+            self.device_manager.ack_tracker.async_expect(device_id, values)
+            if expect_ack
+            else None
+        )
+        result = self._async_queue(device_id, command, values)
+        if ack is not None:
+            result.add_done_callback(
+                lambda future: ack.cancel()
+                if future.cancelled() or future.result() != ReturnCode.SUCCESS
+                else None
+            )
+        return QueuedCommand(result, ack)
+
+    async def async_send_command(
+        self, device_id: str, command: str, values: dict[str, Any]
+    ) -> int:
+        """Queue command of device and wait for result code of merged request."""
+        return await self._async_queue(device_id, command, values)
+
+    @callback
+    def _async_queue(
+        self, device_id: str, command: str, values: dict[str, Any]
+    ) -> asyncio.Future:
+        """Queue command of device, return future of result code."""
+        future = self.hass.loop.create_future()
+        if (device_pending := self._pending.get(device_id)) is None:
+            device_pending = self._pending[device_id] = {}
+            self.hass.loop.call_later(self.window, self._close_window, device_id)
+
+        if (pending := device_pending.get(command)) is not None:
+            pending.values.update(values)
+            pending.futures.append(future)
+        else:
+            device_pending[command] = PendingCommand(
+                dict(values), [future], time.monotonic()
+            )
+
+        self._queued += 1
+        self.device_manager.metrics.stat("command_queue_depth").record(self._queued)
+        return future
+
+    @callback
+    def _close_window(self, device_id: str) -> None:
+        """Move pending commands of device to next batch."""
+        for command, pending in self._pending.pop(device_id, {}).items():
+            self._ready[(device_id, command)] = pending
+
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.hass.loop.call_soon(self._flush)
+
+    @callback
+    def _flush(self) -> None:
+        """Send ready commands as one batch."""
+        self._flush_scheduled = False
+        batch, self._ready = self._ready, {}
+        if len(batch) > 0:
+            self.hass.async_create_task(self._async_send_batch(batch))
+
+    @callback
+    def _acquire_lane(self, device_id: str) -> asyncio.Lock:
+        """Get lane of device, it is kept while requests use it."""
+        self._lane_users[device_id] = self._lane_users.get(device_id, 0) + 1
+        if (lane := self._lanes.get(device_id)) is None:
+            lane = self._lanes[device_id] = asyncio.Lock()
+        return lane
+
+    @callback
+    def _release_lane(self, device_id: str) -> None:
+        """Release lane of device, drop it when it is idle."""
+        if (users := self._lane_users.pop(device_id, 1) - 1) > 0:
+            self._lane_users[device_id] = users
+        else:
+            self._lanes.pop(device_id, None)
+
+    async def _async_send_batch(
+        self, batch: dict[tuple[str, str], PendingCommand]
+    ) -> None:
+        """Send batch of commands."""
+        LOGGER.debug("Sending batch of %d commands", len(batch))
+        metrics = self.device_manager.metrics
+
+        async def send(device_id: str, command: str, pending: PendingCommand):
+            result = ReturnCode.ERROR
+            dequeued = False
+            lane = self._acquire_lane(device_id)
+            try:
+                async with lane, self._semaphore:
+                    start_time = time.monotonic()
+                    self._queued -= len(pending.futures)
+                    dequeued = True
+                    metrics.latency("command_queue_wait").record(
+                        start_time - pending.queued_time
+                    )
+                    result = await self.device_manager.async_send_commands(
+                        device_id, command, pending.values
+                    )
+                    metrics.latency("command_request_latency").record(
+                        time.monotonic() - start_time
+                    )
+            finally:
+                if not dequeued:
+                    # Cancelled before sending
+                    self._queued -= len(pending.futures)
+                self._release_lane(device_id)
+                for future in pending.futures:
+                    if not future.done():
+                        future.set_result(result)
+
+        await asyncio.gather(
+            *(
+                send(device_id, command, pending)
+                for (device_id, command), pending in batch.items()
+            )
+        )
+
+
+class VconnexDeviceManagerExt(VconnexDeviceManager):
+    """Device manager extend."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        async_api: VconnexAsyncApi,
+        options: Mapping[str, Any] | None = None,
+    ) -> None:
+        """Create Device Manager Extend object."""
+        super().__init__(async_api.api)
+        options = options or {}
+        self.hass = hass
+        self.options: Mapping[str, Any] = options
+        self.data_index = DeviceDataIndex()
+        self.windows = RollingWindowRegistry()
+        self.last_seen: dict[str, float] = {}
+        self.entities: dict[str, Entity] = {}
+        self.device_infos: dict[str, tuple[tuple, DeviceInfo]] = {}
+        self.availability = DeviceAvailability(
+            hass,
+            self,
+            options.get(CONF_AVAILABILITY_TIMEOUT, DEFAULT_AVAILABILITY_TIMEOUT),
+        )
+        self.metrics = MetricRegistry()
+        self.optimistic: bool = options.get(CONF_OPTIMISTIC, False)
+        self.ack_tracker = CommandAckTracker(
+            hass, self.metrics, options.get(CONF_ACK_TIMEOUT, DEFAULT_ACK_TIMEOUT)
+        )
+        self.command_batcher = CommandBatcher(
+            hass,
+            self,
+            max_parallel=options.get(CONF_WARMUP_WORKERS, DEFAULT_WARMUP_WORKERS),
+            window=options.get(CONF_COMMAND_WINDOW, DEFAULT_COMMAND_WINDOW) / 1000,
+        )
+        self.async_api = async_api
+        self.fetched_device_ids: set[str] | None = None
+        self._keep_device_objects = False
+        self._prefetched: dict[str, Any] = {}
+        self.push_state_listeners: set[Callable[[bool], None]] = set()
+
+    def apply_options(self, options: Mapping[str, Any]) -> None:
+        """Apply changed options to running components."""
+        self.options = options
+        self.optimistic = options.get(CONF_OPTIMISTIC, False)
+        self.ack_tracker.timeout = options.get(CONF_ACK_TIMEOUT, DEFAULT_ACK_TIMEOUT)
+        self.command_batcher.max_parallel = options.get(
+            CONF_WARMUP_WORKERS, DEFAULT_WARMUP_WORKERS
+        )
+        self.command_batcher.window = (
+            options.get(CONF_COMMAND_WINDOW, DEFAULT_COMMAND_WINDOW) / 1000
+        )
+        self.availability.timeout = options.get(
+            CONF_AVAILABILITY_TIMEOUT, DEFAULT_AVAILABILITY_TIMEOUT
+        )
+
+    def get_device_info(self, device: VconnexDevice) -> DeviceInfo:
+        """Get device info shared by all entities of device."""
+        info_key = device_info_key(device)
+        cached = self.device_infos.get(device.deviceId)
+        if cached is None or cached[0] != info_key:
+            cached = self.device_infos[device.deviceId] = (
+                info_key,
+                DeviceInfo(
+                    identifiers={(DOMAIN, device.deviceId)},
+                    manufacturer=DOMAIN_NAME,
+                    name=device.name,
+                    model=f"[{device.deviceTypeCode}] {device.deviceTypeName}",
+                    sw_version=info_key[3],
+                ),
+            )
+        return cached[1]
+
+    async def async_sync_device_list(self) -> None:
+        """Fetch device list and reconcile device map with it."""
+        try:
+            resp = await self.async_api.async_get(API_DEVICES_PATH)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            LOGGER.exception("Oops, something went wrong!")
+            return
+
+        if (device_list := _parse_device_list(resp)) is not None:
+            await self.async_reconcile_device_list(device_list)
+
+    async def async_reconcile_device_list(
+        self, device_list: list[VconnexDevice]
+    ) -> None:
+        """Reconcile device map with device list.
+
+        Devices are compared by id, device type, param schema, metadata and topic.
+        Objects of kept devices are updated in place, listeners are only notified
+        of changes.
+        The device map is changed on the event loop which also reads it, only the
+        message queue subscriptions of the SDK are changed in the executor.
+        """
+        start_time = time.monotonic()
+        new_device_map = {device.deviceId: device for device in device_list}
+        removed_devices = [
+            self.device_map.pop(device_id)
+            for device_id in list(self.device_map)
+            if device_id not in new_device_map
+        ]
+        added_devices: list[VconnexDevice] = []
+        updated_devices: list[tuple[VconnexDevice, VconnexDevice]] = []
+        for device_id, new_device in new_device_map.items():
+            if (current_device := self.device_map.get(device_id)) is None:
+                self.device_map[device_id] = new_device
+                added_devices.append(new_device)
+                continue
+
+            is_changed = (
+                device_schema_key(current_device) != device_schema_key(new_device)
+                or device_info_key(current_device) != device_info_key(new_device)
+                or getattr(current_device, "topicContent", None)
+                != getattr(new_device, "topicContent", None)
+            )
+            old_device = copy.copy(current_device) if is_changed else None
+            current_data = current_device.data
+            for attr, value in vars(new_device).items():
+                setattr(current_device, attr, value)
+            current_device.data = current_data
+            if old_device is not None:
+                updated_devices.append((current_device, old_device))
+
+        changes = (removed_devices, added_devices, updated_devices)
+        sdk_listener = self.prv_device_listener
+        for listener in list(self.device_listeners):
+            if listener is not sdk_listener:
+                _notify_device_changes(listener, *changes)
+        if sdk_listener is not None:
+            await self.hass.async_add_executor_job(
+                _notify_device_changes, sdk_listener, *changes
+            )
+
+        LOGGER.debug(
+            "Reconciled device list in %.2fs: %d added, %d removed, %d changed",
+            time.monotonic() - start_time,
+            len(added_devices),
+            len(removed_devices),
+            len(updated_devices),
+        )
+
+    def _on_device_list_changed(self, data: Any):
+        """Reconcile device list on change notification of the cloud."""
+        if self.is_initialized():
+            asyncio.run_coroutine_threadsafe(
+                self.async_sync_device_list(), self.hass.loop
+            )
+
+    async def async_prefetch(self) -> None:
+        """Fetch device list and message queue config for next initialization."""
+        self._prefetched.clear()
+        for key, path, params in (
+            ("devices", API_DEVICES_PATH, None),
+            ("mqtt", API_ACCESS_CONFIG_PATH, {"type": "mqtt", "target": "device"}),
+        ):
+            try:
+                resp = await self.async_api.async_get(path, params)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                LOGGER.exception("Oops, something went wrong!")
+                continue
+            if resp is not None:
+                self._prefetched[key] = resp
+
+    async def async_send_commands(
+        self, device_id: str, command: str, values: dict[str, Any]
+    ) -> int:
+        """Send device command."""
+        if device_id not in self.device_map:
+            LOGGER.warning("Device is not exist")
+            return ReturnCode.ERROR
+
+        try:
+            resp = await self.async_api.async_post(
+                API_COMMANDS_PATH,
+                {"deviceId": device_id, "command": command, "values": values},
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            LOGGER.exception("Request command failure")
+            return ReturnCode.ERROR
+
+        result_code = resp.code if resp is not None else ReturnCode.ERROR
+        if result_code != ReturnCode.SUCCESS:
+            LOGGER.warning(
+                "Execute command [%s] of [%s] failure with code=%d",
+                command,
+                device_id,
+                result_code,
+            )
+        return result_code
+
+    def is_push_connected(self) -> bool:
+        """Check if push message queue is connected."""
+        return self.mq_client is not None and self.mq_client.is_connected()
+
+    def reconnect_push(self) -> None:
+        """Recreate push message queue client with fresh access config, blocking.
+
+        The MQTT client loop reconnects the existing client by itself, so this is
+        only used when it does not recover.
+        """
+        mqttc = self.mq_client
+        try:
+            if mqttc is not None:
+                mqttc.loop_stop()
+                mqttc.disconnect()
+                self.mq_client = None
+            if self.prv_message_handler is not None:
+                self.prv_message_handler.stop()
+                self.prv_message_handler = None
+            # Message queue init of the SDK is private
+            self._VconnexDeviceManager__init_mq()  # pylint: disable=no-member
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception("Reconnect push message queue failure")
+
+    def _on_mq_connect(self, mqttc, user_data: Any, flags, rc):
+        super()._on_mq_connect(mqttc, user_data, flags, rc)
+        if rc == 0:
+            self._notify_push_state(True)
+
+    def _on_mq_disconnect(self, client, userdata: Any, rc):
+        super()._on_mq_disconnect(client, userdata, rc)
+        if rc != 0:
+            # Disconnects requested by release or recreate are not losses
+            self._notify_push_state(False)
+
+    def _notify_push_state(self, connected: bool) -> None:
+        """Notify push state listeners, called from MQTT client thread."""
+        for listener in list(self.push_state_listeners):
+            try:
+                listener(connected)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Oops, something went wrong!")
+
+    def release(self) -> None:
+        """Release resource, blocking.
+
+        A manager whose initialization failed or did not finish is released too.
+        The message queue loop is stopped even if it is not connected, the device
+        map is kept so that the manager can be initialized again.
+        """
+        if (mqttc := self.mq_client) is not None:
+            mqttc.loop_stop()
+            if mqttc.is_connected():
+                mqttc.disconnect()
+            self.mq_client = None
+        if self.prv_message_handler is not None:
+            self.prv_message_handler.stop()
+            self.prv_message_handler = None
+        self.remove_message_listener(self._on_message)
+        if self.prv_device_listener is not None:
+            self.remove_device_listener(self.prv_device_listener)
+            self.prv_device_listener = None
+        # Device info sync and initialized flag of the SDK are private
+        # pylint: disable=attribute-defined-outside-init
+        sync_thread = self._VconnexDeviceManager__device_info_sync_thread
+        if sync_thread is not None:
+            sync_thread.stop()
+            self._VconnexDeviceManager__device_info_sync_thread = None
+        self._VconnexDeviceManager__initialized = False
+
+    def initialize(self) -> bool:
+        """Init resource, keep objects of already known devices."""
+        self._keep_device_objects = True
+        try:
+            return super().initialize()
+        finally:
+            self._keep_device_objects = False
+
+    def _get_access_config(self, res_type: str, res_target: str) -> dict[str, Any]:
+        if (res_type, res_target) == ("mqtt", "device") and (
+            resp := self._prefetched.pop("mqtt", None)
+        ) is not None:
+            return resp.data if resp.code == ReturnCode.SUCCESS else None
+        return super()._get_access_config(res_type, res_target)
+
+    def _get_device_list(self):
+        if (resp := self._prefetched.pop("devices", None)) is not None:
+            device_list = _parse_device_list(resp)
+        else:
+            device_list = super()._get_device_list()
+        if device_list is None:
+            return None
+
+        self.fetched_device_ids = {device.deviceId for device in device_list}
+        if not self._keep_device_objects:
+            return device_list
+
+        merged_device_list = []
+        for device in device_list:
+            if (current_device := self.device_map.get(device.deviceId)) is not None:
+                current_data = current_device.data
+                for attr, value in vars(device).items():
+                    setattr(current_device, attr, value)
+                current_device.data = current_data
+                device = current_device
+            merged_device_list.append(device)
+        return merged_device_list
+
+
+class DeviceSnapshot(VconnexDeviceListener):
+    """Persistent snapshot of device map, params and last device data."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        device_manager: VconnexDeviceManagerExt | None,
+    ) -> None:
+        """Create Device Snapshot object."""
+        self.hass = hass
+        self.device_manager = device_manager
+        self._store = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot"
+        )
+        self._save_pending = False
+
+    async def async_restore(self) -> bool:
+        """Restore device map of device manager from snapshot."""
+        try:
+            snapshot = await self._store.async_load()
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception("Could not load device snapshot")
+            return False
+
+        if not snapshot or not (raw_list := snapshot.get("devices")):
+            return False
+
+        device_map = {}
+        for raw in raw_list:
+            raw = dict(raw)
+            messages = raw.pop("data", None) or {}
+            device = VconnexDevice(**raw)
+            device.data.update(messages)
+            self.device_manager.data_index.update(device)
+            device_map[device.deviceId] = device
+        self.device_manager.device_map = device_map
+        LOGGER.debug("Restored %d devices from snapshot", len(device_map))
+        return True
+
+    async def async_remove(self) -> None:
+        """Remove snapshot."""
+        await self._store.async_remove()
+
+    async def async_save(self) -> None:
+        """Save snapshot now."""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Schedule saving snapshot unless a save is pending.
+
+        The delay is not restarted by later changes, so frequent pushes do not
+        postpone the save until shutdown.
+        """
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    def _request_save(self) -> None:
+        """Request saving snapshot, called from SDK threads."""
+        if not self._save_pending:
+            self.hass.loop.call_soon_threadsafe(self.async_schedule_save)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Get snapshot data, called when snapshot is written."""
+        self._save_pending = False
+        devices = []
+        for device in list(self.device_manager.device_map.values()):
+            raw = {
+                attr: value for attr, value in vars(device).items() if attr != "data"
+            }
+            raw["data"] = {
+                message_name: {
+                    "name": message_name,
+                    "devV": message.get("devV"),
+                    "ts": message.get("ts"),
+                }
+                for message_name in INDEXED_MESSAGE_NAMES
+                if (message := device.data.get(message_name)) is not None
+            }
+            devices.append(raw)
+        return {"devices": devices}
+
+    def on_device_added(self, device: VconnexDevice):
+        """On device added callback."""
+        self._request_save()
+
+    def on_device_removed(self, device: VconnexDevice):
+        """On device removed callback."""
+        self._request_save()
+
+    def on_device_update(
+        self, new_device: VconnexDevice, old_device: VconnexDevice = None
+    ):
+        """On device update callback."""
+        self._request_save()
+
+
+class PlatformEntityFactory(NamedTuple):
+    """Entity factory of platform."""
+
+    resolver_list: list
+    entity_class: Callable[..., Entity]
+    async_add_entities: AddEntitiesCallback
+
+
+class VconnexEntityBuilder:
+    """Build entities of all platforms in a single pass over devices.
+
+    Devices are indexed by deviceTypeCode and the device type to platform table is
+    combined from the resolvers of registered platforms, so each device is
+    classified once and each platform only receives its own entities. Platforms
+    are loaded when the first device of their types is known. Entities are built
+    and added in chunks, the event loop is released between chunks.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, device_manager: VconnexDeviceManagerExt
+    ) -> None:
+        """Create Vconnex Entity Builder object."""
+        self.hass = hass
+        self.device_manager = device_manager
+        self._platforms: dict[str, PlatformEntityFactory] = {}
+        self._type_platforms: dict[int, list[str]] = {}
+        self._type_devices: dict[int, dict[str, None]] | None = None
+        self._load_platforms: Callable[[list[str]], Awaitable] | None = None
+        self.loaded_platforms: set[str] = set()
+        self._load_tasks: set[asyncio.Task] = set()
+        self._build_tasks: set[asyncio.Task] = set()
+        self.startup_report: dict[str, Any] | None = None
+
+    async def async_setup_platforms(
+        self, load_platforms: Callable[[list[str]], Awaitable]
+    ) -> None:
+        """Load platforms of known devices, others are loaded on demand."""
+        start_time = time.monotonic()
+        self._load_platforms = load_platforms
+        platforms = self._missing_platforms(self._get_type_devices())
+        LOGGER.debug("Loading platforms %s", platforms)
+        self.loaded_platforms.update(platforms)
+        await load_platforms(platforms)
+        self.hass.async_create_task(self._async_report_startup(start_time))
+
+    async def _async_report_startup(self, start_time: float) -> None:
+        """Sample event loop lag until startup entities are registered.
+
+        Entities are registered by tasks of Home Assistant after they are added, so
+        lag is sampled from timer drift until registered entities catch up with
+        built ones or stop increasing.
+        """
+        metrics = self.device_manager.metrics
+        built = metrics.counter("entity_build")
+        loop_lag = metrics.latency("startup_loop_lag")
+        entities = self.device_manager.entities
+        registered, progress_time = -1, start_time
+        while self._build_tasks or self._load_tasks or len(entities) < built.value:
+            now = time.monotonic()
+            if len(entities) != registered:
+                registered, progress_time = len(entities), now
+            elif (
+                not (self._build_tasks or self._load_tasks)
+                and now - progress_time > ENTITY_ADD_SETTLE_TIME
+            ):
+                break
+            await asyncio.sleep(LOOP_LAG_SAMPLE_INTERVAL)
+            loop_lag.record(
+                max(0.0, time.monotonic() - now - LOOP_LAG_SAMPLE_INTERVAL)
+            )
+
+        chunk_time = metrics.latency("entity_build_chunk_time")
+        self.startup_report = {
+            "entities": built.value,
+            "registered": len(entities),
+            "chunks": chunk_time.count,
+            "duration": round(time.monotonic() - start_time, 3),
+            "longest_stall": (
+                round(loop_lag.max, 4) if loop_lag.max is not None else None
+            ),
+        }
+        LOGGER.debug(
+            "Registered %d of %d entities in %.2fs, longest loop stall %.1fms",
+            self.startup_report["registered"],
+            self.startup_report["entities"],
+            self.startup_report["duration"],
+            (loop_lag.max or 0) * 1000,
+        )
+
+    async def async_unload_platforms(
+        self, unload_platforms: Callable[[list[str]], Awaitable[bool]]
+    ) -> bool:
+        """Unload loaded platforms after their pending loads."""
+        for task in self._build_tasks:
+            task.cancel()
+        if self._load_tasks:
+            await asyncio.gather(*self._load_tasks, return_exceptions=True)
+        return await unload_platforms(list(self.loaded_platforms))
+
+    def _missing_platforms(self, device_types: Iterable[int | None]) -> list[str]:
+        """Get platforms of device types which are not loaded."""
+        device_types = set(device_types)
+        return [
+            platform
+            for platform in PLATFORMS
+            if platform not in self.loaded_platforms
+            and not PLATFORM_DEVICE_TYPES[platform].isdisjoint(device_types)
+        ]
+
+    @callback
+    def async_register_platform(
+        self,
+        platform: str,
+        resolver_list: list,
+        entity_class: Callable[..., Entity],
+        async_add_entities: AddEntitiesCallback,
+    ) -> None:
+        """Register platform and add entities of its known devices."""
+        factory = PlatformEntityFactory(resolver_list, entity_class, async_add_entities)
+        self._platforms[platform] = factory
+
+        device_types: set[int] = set()
+        for resolver in resolver_list:
+            device_types.update(resolver.device_types)
+        for device_type in device_types:
+            platforms = self._type_platforms.setdefault(device_type, [])
+            if platform not in platforms:
+                platforms.append(platform)
+
+        type_devices = self._get_type_devices()
+        devices = [
+            device
+            for device_type in device_types
+            for device_id in type_devices.get(device_type, ())
+            if (device := self.device_manager.device_map.get(device_id)) is not None
+        ]
+        self._async_schedule_build(factory, devices)
+
+    @callback
+    def async_add_devices(self, device_ids: Iterable[str]) -> None:
+        """Build entities of added devices for registered platforms."""
+        type_devices = self._get_type_devices()
+        device_types: set[int | None] = set()
+        platform_devices: dict[str, list[VconnexDevice]] = {}
+        for device_id in device_ids:
+            if (device := self.device_manager.device_map.get(device_id)) is None:
+                continue
+            device_type = _device_type_code(device)
+            type_devices.setdefault(device_type, {})[device_id] = None
+            device_types.add(device_type)
+            for platform in self._type_platforms.get(device_type, ()):
+                platform_devices.setdefault(platform, []).append(device)
+
+        # Entities of a loaded platform are built when it registers
+        if self._load_platforms is not None and (
+            platforms := self._missing_platforms(device_types)
+        ):
+            LOGGER.debug("Loading platforms %s", platforms)
+            self.loaded_platforms.update(platforms)
+            task = self.hass.async_create_task(self._load_platforms(platforms))
+            self._load_tasks.add(task)
+            task.add_done_callback(self._load_tasks.discard)
+
+        for platform, devices in platform_devices.items():
+            self._async_schedule_build(self._platforms[platform], devices)
+
+    def _get_type_devices(self) -> dict[int, dict[str, None]]:
+        """Get device ids indexed by device type."""
+        if self._type_devices is None:
+            self._type_devices = {}
+            for device_id, device in self.device_manager.device_map.items():
+                self._type_devices.setdefault(_device_type_code(device), {})[
+                    device_id
+                ] = None
+        return self._type_devices
+
+    @callback
+    def _async_schedule_build(
+        self, factory: PlatformEntityFactory, devices: list[VconnexDevice]
+    ) -> None:
+        """Schedule building entities of devices."""
+        if not devices:
+            return
+        task = self.hass.async_create_task(self._async_build_entities(factory, devices))
+        self._build_tasks.add(task)
+        task.add_done_callback(self._build_tasks.discard)
+
+    async def _async_build_entities(
+        self, factory: PlatformEntityFactory, devices: list[VconnexDevice]
+    ) -> None:
+        """Build and add entities of devices in chunks.
+
+        Each chunk is built and handed to the platform without yielding, its
+        duration is recorded as chunk time.
+        """
+        built = self.device_manager.metrics.counter("entity_build")
+        chunk_time = self.device_manager.metrics.latency("entity_build_chunk_time")
+        entities: list[Entity] = []
+        start_time = time.monotonic()
+        for index, device in enumerate(devices):
+            for description_list_resolver in factory.resolver_list:
+                for description in description_list_resolver.from_device(device):
+                    entities.append(
+                        factory.entity_class(
+                            vconnex_device=device,
+                            device_manager=self.device_manager,
+                            description=description,
+                        )
+                    )
+
+            if len(entities) >= ENTITY_CHUNK_SIZE or index == len(devices) - 1:
+                if entities:
+                    factory.async_add_entities(entities)
+                    built.inc(len(entities))
+                    entities = []
+                chunk_time.record(time.monotonic() - start_time)
+                await asyncio.sleep(0)
+                start_time = time.monotonic()
+
+
+def _notify_device_changes(
+    listener: VconnexDeviceListener,
+    removed_devices: list[VconnexDevice],
+    added_devices: list[VconnexDevice],
+    updated_devices: list[tuple[VconnexDevice, VconnexDevice]],
+) -> None:
+    """Notify device listener of removed, added and updated devices.
+
+    Each device is notified separately, a failed notification does not skip the
+    others.
+    """
+    notifications: list[tuple[Callable, tuple]] = [
+        *((listener.on_device_removed, (device,)) for device in removed_devices),
+        *((listener.on_device_added, (device,)) for device in added_devices),
+        *((listener.on_device_update, devices) for devices in updated_devices),
+    ]
+    for notify, args in notifications:
+        try:
+            notify(*args)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception("Oops, something went wrong!")
+
+
+def _parse_device_list(resp: ApiResponse | None) -> list[VconnexDevice] | None:
+    """Parse device list response."""
+    if resp is None:
+        return None
+    if resp.code == ReturnCode.SUCCESS and resp.data is not None:
+        return [VconnexDevice(**raw) for raw in resp.data]
+    if resp.code == ReturnCode.NOT_FOUND:
+        return []
+    return None
+
+
+def device_schema_key(device: VconnexDevice) -> tuple[int | None, int]:
+    """Get key of device type and param schema, entities depend on it."""
+    return (
+        _device_type_code(device),
+        hash(
+            tuple(
+                (param.get("paramKey"), param.get("name"), param.get("type"))
+                for param in device.params or ()
+            )
+        ),
+    )
+
+
+def device_info_key(device: VconnexDevice) -> tuple:
+    """Get key of device metadata, device info and entity names depend on it."""
+    return (
+        device.name,
+        device.deviceTypeCode,
+        device.deviceTypeName,
+        getattr(device, "version", None),
+    )
+
+
+def _device_type_code(device: VconnexDevice) -> int | None:
+    """Get device type code of device."""
+    try:
+        return int(device.deviceTypeCode)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
 
 class HomeAssistantVconnexData(NamedTuple):
     """Home Assistant data for Vconnex domain."""
 
     config_data: dict[str, Any]
-    device_manager: VconnexDeviceManager
+    device_manager: VconnexDeviceManagerExt
+    snapshot: DeviceSnapshot
+    entity_builder: VconnexEntityBuilder
 
 
 async def init_sdk(
     hass: HomeAssistant, entry: ConfigEntry
 ) -> HomeAssistantVconnexData | None:
-    """Init vconnex sdk."""
-    api = VconnexAPI(
-        endpoint=DEFAULT_ENDPOINT,
-        client_id=entry.data[CONF_CLIENT_ID],
-        client_secret=entry.data[CONF_CLIENT_SECRET],
-        project_code=PROJECT_CODE,
+    """Init vconnex sdk.
+
+    Devices are restored from snapshot if exists, then connect_sdk should be
+    called after platforms are set up.
+    """
+    async_api = await async_get_transport_manager(hass).async_acquire(
+        entry.entry_id, entry.data[CONF_CLIENT_ID], entry.data[CONF_CLIENT_SECRET]
     )
+    device_manager = VconnexDeviceManagerExt(hass, async_api, entry.options)
+    snapshot = DeviceSnapshot(hass, entry.entry_id, device_manager)
 
-    if not await hass.async_add_executor_job(api.is_valid):
-        LOGGER.error("Cannot connect!")
+    if not await snapshot.async_restore() and not await async_connect_sdk(
+        hass, entry, device_manager, snapshot
+    ):
         return None
 
-    device_manager = VconnexDeviceManager(api)
-    await hass.async_add_executor_job(device_manager.initialize)
-
-    if not device_manager.is_initialized():
-        LOGGER.error(
-            "Could not initialize! Please reload integration or restart the server"
+    entity_builder = VconnexEntityBuilder(hass, device_manager)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, DispatcherSignal.DEVICE_ADDED, entity_builder.async_add_devices
         )
-        return None
-
-    hass.async_add_executor_job(
-        retrieve_device_data,
-        device_manager.device_map.values(),
-        device_manager,
     )
 
-    device_manager.add_device_listener(DeviceListener(hass, device_manager))
-
     config_data = dict(entry.data)
     config_data.pop(CONF_CLIENT_SECRET, None)
 
     return HomeAssistantVconnexData(
-        config_data=config_data, device_manager=device_manager
+        config_data=config_data,
+        device_manager=device_manager,
+        snapshot=snapshot,
+        entity_builder=entity_builder,
+    )
+
+
+async def async_connect_sdk(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    device_manager: VconnexDeviceManagerExt,
+    snapshot: DeviceSnapshot,
+) -> bool:
+    """Connect vconnex sdk and reconcile devices with known device map."""
+    if device_manager.is_initialized():
+        return True
+
+    start_time = time.monotonic()
+    if not await device_manager.async_api.async_is_valid():
+        LOGGER.error("Cannot connect!")
+        return False
+
+    known_schema_keys = {
+        device_id: device_schema_key(device)
+        for device_id, device in device_manager.device_map.items()
+    }
+    await device_manager.async_prefetch()
+    # Only the message queue connection is left blocking
+    init_job = hass.async_add_executor_job(device_manager.initialize)
+    try:
+        await asyncio.shield(init_job)
+    except asyncio.CancelledError:
+        # Entry is unloaded, release resources when initialization finishes
+        init_job.add_done_callback(
+            lambda _: hass.async_add_executor_job(device_manager.release)
+        )
+        raise
+
+    if not device_manager.is_initialized():
+        LOGGER.error("Could not initialize!")
+        await hass.async_add_executor_job(device_manager.release)
+        return False
+
+    device_manager.add_device_listener(DeviceListener(hass, device_manager))
+    device_manager.add_device_listener(snapshot)
+    entry.async_on_unload(StalePollScheduler(hass, device_manager).async_start())
+    entry.async_on_unload(device_manager.availability.async_start())
+    entry.async_on_unload(PushSupervisor(hass, device_manager).async_start())
+
+    hass.async_create_task(
+        async_retrieve_device_data(
+            hass,
+            device_manager.device_map.values(),
+            device_manager,
+            device_manager.options,
+        )
     )
 
+    if (fetched_device_ids := device_manager.fetched_device_ids) is not None:
+        for device_id in known_schema_keys.keys() - fetched_device_ids:
+            device_manager.device_map.pop(device_id, None)
+            device_manager.data_index.remove(device_id)
+            device_manager.device_infos.pop(device_id, None)
+            device_manager.availability.async_forget(device_id)
+            async_dispatcher_send(
+                hass, f"{DispatcherSignal.DEVICE_REMOVED}.{device_id}"
+            )
+            async_remove_device_entry(hass, device_id)
+
+    # Entities of devices whose type or param schema changed are rebuilt
+    added_device_ids = []
+    for device_id, device in device_manager.device_map.items():
+        if (schema_key := known_schema_keys.get(device_id)) is None:
+            added_device_ids.append(device_id)
+        elif schema_key != device_schema_key(device):
+            async_dispatcher_send(
+                hass, f"{DispatcherSignal.DEVICE_REMOVED}.{device_id}"
+            )
+            added_device_ids.append(device_id)
+    if added_device_ids:
+        async_dispatcher_send(hass, DispatcherSignal.DEVICE_ADDED, added_device_ids)
+
+    snapshot.async_schedule_save()
+    LOGGER.debug("Connected in %.2fs", time.monotonic() - start_time)
+    return True
+
+
+async def async_keep_connecting_sdk(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    device_manager: VconnexDeviceManagerExt,
+    snapshot: DeviceSnapshot,
+) -> None:
+    """Connect vconnex sdk of restored devices, retry with backoff until connected.
+
+    Restored devices are unavailable while connecting fails.
+    """
+    attempt = 0
+    while not await async_connect_sdk(hass, entry, device_manager, snapshot):
+        if attempt == 0:
+            device_manager.availability.async_mark_unavailable(
+                list(device_manager.device_map)
+            )
+        delay = min(CONNECT_RETRY_BASE * 2**attempt, CONNECT_RETRY_MAX)
+        attempt += 1
+        LOGGER.warning("Connect failure, retry in %ds", delay)
+        await asyncio.sleep(delay)
+
 
 def release_sdk(data: HomeAssistantVconnexData):
-    """Release Vconnex sdk."""
+    """Release Vconnex sdk, blocking."""
     try:
         data.device_manager.release()
     except Exception:  # pylint: disable=broad-except
         LOGGER.exception("Oops, something went wrong!")
 
 
-def retrieve_device_data(
-    device_list: list[VconnexDevice], device_manager: VconnexDeviceManager
-):
-    """Retrieve all device data."""
-    if list is not None:
-        for device in device_list:
+@callback
+def async_remove_device_entry(hass: HomeAssistant, device_id: str) -> None:
+    """Remove device registry entry of device."""
+    device_reg = device_registry.async_get(hass)
+    device_entry = device_reg.async_get_device(identifiers={(DOMAIN, device_id)})
+    if device_entry is not None:
+        device_reg.async_remove_device(device_entry.id)
+
+
+def _retrieve_priority(device: VconnexDevice) -> int:
+    """Get retrieve priority of device, lower is first."""
+    return 0 if _device_type_code(device) in CONTROLLABLE_DEVICE_TYPES else 1
+
+
+async def async_retrieve_device_data(
+    hass: HomeAssistant,
+    device_list: Iterable[VconnexDevice],
+    device_manager: VconnexDeviceManagerExt,
+    options: Mapping[str, Any] | None = None,
+) -> None:
+    """Retrieve data of devices with bounded concurrency.
+
+    Devices having switch or cover entities are requested first.
+    """
+    options = options or {}
+    max_workers = options.get(CONF_WARMUP_WORKERS, DEFAULT_WARMUP_WORKERS)
+    timeout = options.get(CONF_WARMUP_TIMEOUT, DEFAULT_WARMUP_TIMEOUT)
+
+    devices = sorted(device_list, key=_retrieve_priority)
+    total = len(devices)
+    if total == 0:
+        return
+
+    semaphore = asyncio.Semaphore(max_workers)
+    start_time = time.monotonic()
+    finished = 0
+
+    async def retrieve(device: VconnexDevice) -> None:
+        nonlocal finished
+        async with semaphore:
+            try:
+                await asyncio.wait_for(
+                    device_manager.command_batcher.async_send_command(
+                        device.deviceId, CommandName.GET_DATA, {"all": 1}
+                    ),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                LOGGER.warning(
+                    "Request data of device [%s] timed out after %ss",
+                    device.deviceId,
+                    timeout,
+                )
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Request command failure")
+        finished += 1
+        LOGGER.debug("Retrieving device data: %d/%d", finished, total)
+
+    await asyncio.gather(*(retrieve(device) for device in devices))
+    LOGGER.info(
+        "Retrieved data of %d devices in %.2fs", total, time.monotonic() - start_time
+    )
+
+
+class StalePollScheduler:
+    """Request data of devices which have not been updated for a while.
+
+    Devices are scanned periodically, stale devices are requested at a capped
+    rate with jitter, devices having switch or cover entities first, then devices
+    with extended data, then the longest stale ones.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, device_manager: VconnexDeviceManagerExt
+    ) -> None:
+        """Create Stale Poll Scheduler object."""
+        self.hass = hass
+        self.device_manager = device_manager
+        self._start_time = time.monotonic()
+        self._polled: dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def stale_after(self) -> float:
+        """Get staleness limit of devices, 0 if disabled."""
+        return self.device_manager.options.get(CONF_STALE_AFTER, DEFAULT_STALE_AFTER)
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Start scanning, return stop function."""
+        unsub = async_track_time_interval(
+            self.hass, self._async_scan, STALE_SCAN_INTERVAL
+        )
+
+        @callback
+        def stop() -> None:
+            unsub()
+            if self._task is not None:
+                self._task.cancel()
+
+        return stop
+
+    @callback
+    def _async_scan(self, _now=None) -> None:
+        """Find stale devices and start requesting their data."""
+        if self.stale_after <= 0 or (self._task is not None and not self._task.done()):
+            return
+
+        now = time.monotonic()
+        stale_devices: list[tuple[tuple, VconnexDevice]] = []
+        for device_id, device in self.device_manager.device_map.items():
+            last_time = max(
+                self.device_manager.last_seen.get(device_id, self._start_time),
+                self._polled.get(device_id, self._start_time),
+            )
+            if now - last_time >= self.stale_after:
+                stale_devices.append((self._priority(device, last_time), device))
+
+        if stale_devices:
+            stale_devices.sort(key=lambda item: item[0])
+            self._task = self.hass.async_create_task(
+                self._async_poll([device for _, device in stale_devices])
+            )
+
+    @staticmethod
+    def _priority(device: VconnexDevice, last_time: float) -> tuple:
+        """Get poll priority of device, lower is first."""
+        return (
+            _retrieve_priority(device),
+            MessageName.EXTENDED_DEVICE_DATA not in device.data,
+            last_time,
+        )
+
+    async def _async_poll(self, devices: list[VconnexDevice]) -> None:
+        """Request data of devices at capped rate."""
+        options = self.device_manager.options
+        interval = 1 / options.get(CONF_POLL_RATE, DEFAULT_POLL_RATE)
+        timeout = options.get(CONF_WARMUP_TIMEOUT, DEFAULT_WARMUP_TIMEOUT)
+        metric = self.device_manager.metrics.counter("stale_poll")
+        for device in devices:
+            await asyncio.sleep(interval * (1 + random.random() / 2))
+            if device.deviceId not in self.device_manager.device_map:
+                continue
+
+            self._polled[device.deviceId] = time.monotonic()
+            metric.inc()
+            LOGGER.debug("Requesting data of stale device [%s]", device.deviceId)
             try:
-                device_manager.send_commands(
-                    device.deviceId, CommandName.GET_DATA, {"all": 1}
+                await asyncio.wait_for(
+                    self.device_manager.command_batcher.async_send_command(
+                        device.deviceId, CommandName.GET_DATA, {"all": 1}
+                    ),
+                    timeout,
                 )
+            except asyncio.TimeoutError:
+                LOGGER.debug("Request data of device [%s] timed out", device.deviceId)
             except Exception:  # pylint: disable=broad-except
                 LOGGER.exception("Request command failure")
 
 
+class PushSupervisor:
+    """Supervise push connection by connect and disconnect events of MQTT client.
+
+    The MQTT client loop reconnects by itself. The client is only recreated,
+    with jittered exponential backoff, when it does not recover in time. After
+    recovery, devices which have not been seen since the connection was lost are
+    requested again.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, device_manager: VconnexDeviceManagerExt
+    ) -> None:
+        """Create Push Supervisor object."""
+        self.hass = hass
+        self.device_manager = device_manager
+        self._disconnected_time: float | None = None
+        self._attempt = 0
+        self._next_attempt_time = 0.0
+        self._task: asyncio.Task | None = None
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Start supervising, return stop function."""
+        listeners = self.device_manager.push_state_listeners
+        listeners.add(self._on_push_state_changed)
+        unsub = async_track_time_interval(
+            self.hass, self._async_check, PUSH_CHECK_INTERVAL
+        )
+
+        @callback
+        def stop() -> None:
+            listeners.discard(self._on_push_state_changed)
+            unsub()
+            if self._task is not None:
+                self._task.cancel()
+
+        return stop
+
+    def _on_push_state_changed(self, connected: bool) -> None:
+        """Handle push state change, called from MQTT client thread."""
+        self.hass.loop.call_soon_threadsafe(
+            self._async_push_state_changed, connected, time.monotonic()
+        )
+
+    @callback
+    def _async_push_state_changed(self, connected: bool, now: float) -> None:
+        """Record lost connection or recover from it."""
+        if not connected:
+            self._async_lost(now)
+        elif self._disconnected_time is not None:
+            self._async_recovered(now)
+
+    @callback
+    def _async_lost(self, now: float) -> None:
+        """Record lost connection, give the client loop time to reconnect."""
+        if self._disconnected_time is None:
+            LOGGER.warning("Push connection lost")
+            self._disconnected_time = now
+            self._attempt = 0
+            self._next_attempt_time = now + PUSH_SELF_RECOVERY_TIME
+
+    @callback
+    def _async_check(self, _now=None) -> None:
+        """Recreate push connection which does not recover by itself."""
+        if self._task is not None and not self._task.done():
+            return
+
+        now = time.monotonic()
+        if self.device_manager.is_push_connected():
+            if self._disconnected_time is not None:
+                self._async_recovered(now)
+            return
+
+        self._async_lost(now)
+        if now >= self._next_attempt_time:
+            self._task = self.hass.async_create_task(self._async_reconnect())
+
+    async def _async_reconnect(self) -> None:
+        """Recreate push connection and schedule next attempt."""
+        self._attempt += 1
+        self.device_manager.metrics.counter("push_reconnect_attempt").inc()
+        LOGGER.debug("Recreating push connection, attempt %d", self._attempt)
+        await self.hass.async_add_executor_job(self.device_manager.reconnect_push)
+        delay = min(PUSH_BACKOFF_BASE * 2 ** (self._attempt - 1), PUSH_BACKOFF_MAX)
+        self._next_attempt_time = time.monotonic() + delay * random.uniform(0.5, 1.5)
+
+    @callback
+    def _async_recovered(self, now: float) -> None:
+        """Record recovery and resync devices which may have missed updates."""
+        disconnected_time = self._disconnected_time
+        self._disconnected_time = None
+        metrics = self.device_manager.metrics
+        metrics.counter("push_reconnect").inc()
+        metrics.latency("push_recovery_time").record(now - disconnected_time)
+
+        last_seen = self.device_manager.last_seen
+        devices = [
+            device
+            for device_id, device in self.device_manager.device_map.items()
+            if last_seen.get(device_id, 0) < disconnected_time
+        ]
+        LOGGER.info(
+            "Push connection recovered in %.2fs, resync %d devices",
+            now - disconnected_time,
+            len(devices),
+        )
+        self.hass.async_create_task(
+            async_retrieve_device_data(
+                self.hass, devices, self.device_manager, self.device_manager.options
+            )
+        )
+
+
 class DeviceListener(VconnexDeviceListener):
     """DeviceListener for HomeAssistan."""
 
     def __init__(
-        self, hass: HomeAssistant, device_manager: VconnexDeviceManager
+        self, hass: HomeAssistant, device_manager: VconnexDeviceManagerExt
     ) -> None:
         """Init new Device Listener object."""
         self.hass = hass
         self.device_manager = device_manager
+        self.push_queue = PushIngestQueue(hass, device_manager)
 
     def on_device_added(self, device: VconnexDevice):
         """On device added callback."""
         dispatcher_send(
             self.hass, f"{DispatcherSignal.DEVICE_ADDED}", [device.deviceId]
         )
-        retrieve_device_data([device], self.device_manager)
+        self.hass.add_job(
+            async_retrieve_device_data,
+            self.hass,
+            [device],
+            self.device_manager,
+            self.device_manager.options,
+        )
 
     def on_device_removed(self, device: VconnexDevice):
         """On device removed callback."""
+        self.device_manager.data_index.remove(device.deviceId)
+        self.device_manager.device_infos.pop(device.deviceId, None)
         dispatcher_send(
             self.hass, f"{DispatcherSignal.DEVICE_REMOVED}.{device.deviceId}"
         )
@@ -122,16 +2093,28 @@ class DeviceListener(VconnexDeviceListener):
         self, new_device: VconnexDevice, old_device: VconnexDevice = None
     ):
         """On device update callback."""
-        dispatcher_send(
-            self.hass, f"{DispatcherSignal.DEVICE_UPDATED}.{new_device.deviceId}"
+        if (
+            old_device is not None
+            and old_device is not new_device
+            and (
+                device_schema_key(old_device) != device_schema_key(new_device)
+                or device_info_key(old_device) != device_info_key(new_device)
+            )
+        ):
+            # Rebuild entities of device, their names and device info may change
+            dispatcher_send(
+                self.hass, f"{DispatcherSignal.DEVICE_REMOVED}.{new_device.deviceId}"
+            )
+            self.on_device_added(new_device)
+            return
+
+        self.push_queue.put(
+            new_device.deviceId,
+            all_changed=old_device is not None and old_device is not new_device,
         )
 
     @callback
     async def remove_device_entry(self, device: VconnexDevice):
         """Remove device entry."""
-        device_reg = device_registry.async_get(self.hass)
-        device_entry = device_reg.async_get_device(
-            identifiers={(DOMAIN, device.deviceId)}
-        )
-        if device_entry is not None:
-            device_reg.async_remove_device(device_entry.id)
+        self.device_manager.availability.async_forget(device.deviceId)
+        async_remove_device_entry(self.hass, device.deviceId)
@@ -0,0 +1,100 @@
+"""Benchmark per-update cost of entity param reads.
+
+Compares the linear scan of the devV list, which every entity read did
+before, with DeviceDataIndex which is built once per payload.
+
+Run from repository root: python scripts/bench_data_index.py
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# pylint: disable=wrong-import-position
+from vconnex.device import VconnexDevice  # noqa: E402
+
+from custom_components.vconnex_cc.const import MessageName  # noqa: E402
+from custom_components.vconnex_cc.vconnex_wrap import DeviceDataIndex  # noqa: E402
+
+
+def make_device(param_count: int) -> VconnexDevice:
+    """Create energy meter device with param_count params."""
+    return VconnexDevice(
+        deviceId="bench",
+        name="Bench",
+        deviceTypeCode=3009,
+        deviceTypeName="Energy meter",
+        params=[
+            {"paramKey": f"param_{index}", "name": f"Param {index}", "type": 2}
+            for index in range(param_count)
+        ],
+    )
+
+
+def make_message(param_count: int, seq: int) -> dict:
+    """Create CmdGetData message, every update is a new payload object."""
+    return {
+        "name": MessageName.GET_DATA,
+        "devV": [
+            {"param": f"param_{index}", "value": index + seq}
+            for index in range(param_count)
+        ],
+    }
+
+
+def scan_update(device: VconnexDevice, params: list[str]) -> None:
+    """Read param of each entity by scanning devV list."""
+    for param in params:
+        for d_value in device.data[MessageName.GET_DATA].get("devV"):
+            if d_value.get("param") == param:
+                break
+
+
+def index_update(
+    device: VconnexDevice, params: list[str], data_index: DeviceDataIndex
+) -> None:
+    """Index payload once, then read param of each entity from index."""
+    data_index.update(device)
+    for param in params:
+        data_index.get_values(device, MessageName.GET_DATA).get(param)
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--params", type=int, default=32)
+    parser.add_argument("--updates", type=int, default=20000)
+    args = parser.parse_args()
+
+    device = make_device(args.params)
+    params = [f"param_{index}" for index in range(args.params)]
+    messages = [make_message(args.params, seq) for seq in range(2)]
+    data_index = DeviceDataIndex()
+    seq = 0
+
+    def next_payload() -> None:
+        nonlocal seq
+        seq ^= 1
+        device.data[MessageName.GET_DATA] = messages[seq]
+
+    # Payload switching is measured alone and subtracted
+    base = timeit.timeit(next_payload, number=args.updates)
+    before = timeit.timeit(
+        lambda: (next_payload(), scan_update(device, params)), number=args.updates
+    )
+    after = timeit.timeit(
+        lambda: (next_payload(), index_update(device, params, data_index)),
+        number=args.updates,
+    )
+
+    print(f"{args.params} params read by {args.params} entities per update")
+    print(f"before (devV scan): {(before - base) / args.updates * 1e6:.1f} us/update")
+    print(f"after (data index): {(after - base) / args.updates * 1e6:.1f} us/update")
+
+
+if __name__ == "__main__":
+    main()
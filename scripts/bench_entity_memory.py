@@ -0,0 +1,101 @@
+"""Benchmark memory of entities in bytes per entity.
+
+Builds switch entities of three gang switch devices and measures allocated
+memory with tracemalloc, device data index included.
+
+Run from repository root: python scripts/bench_entity_memory.py
+"""
+from __future__ import annotations
+
+import argparse
+from functools import partial
+import gc
+from pathlib import Path
+import sys
+import tracemalloc
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# pylint: disable=wrong-import-position
+from vconnex.device import VconnexDevice  # noqa: E402
+
+from custom_components.vconnex_cc import switch  # noqa: E402
+from custom_components.vconnex_cc.const import MessageName  # noqa: E402
+from custom_components.vconnex_cc.vconnex_wrap import (  # noqa: E402
+    DeviceDataIndex,
+    VconnexDeviceManagerExt,
+)
+
+GANG_PARAMS = ("sw_1", "sw_2", "sw_3")
+
+
+def make_devices(count: int) -> list[VconnexDevice]:
+    """Create three gang switch devices with data."""
+    devices = []
+    for index in range(count):
+        device = VconnexDevice(
+            deviceId=f"device_{index:05d}",
+            name=f"Device {index}",
+            deviceTypeCode=3012,
+            deviceTypeName="Switch 3",
+            version="1.0",
+            params=[
+                {"paramKey": param, "name": f"Switch {param[-1]}", "type": 1}
+                for param in GANG_PARAMS
+            ],
+        )
+        device.data[MessageName.GET_DATA] = {
+            "devV": [{"param": param, "value": 1} for param in GANG_PARAMS]
+        }
+        devices.append(device)
+    return devices
+
+
+def make_device_manager() -> MagicMock:
+    """Create device manager with the parts entities use."""
+    device_manager = MagicMock()
+    device_manager.data_index = DeviceDataIndex()
+    device_manager.device_infos = {}
+    device_manager.get_device_info = partial(
+        VconnexDeviceManagerExt.get_device_info, device_manager
+    )
+    return device_manager
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=500)
+    args = parser.parse_args()
+
+    devices = make_devices(args.devices)
+    device_manager = make_device_manager()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+
+    entities = []
+    for device in devices:
+        device_manager.data_index.update(device)
+        for resolver in switch.ENTITY_DESC_LIST_RESOLVER_LIST:
+            for description in resolver.from_device(device):
+                entities.append(
+                    switch.TargetEntity(
+                        vconnex_device=device,
+                        device_manager=device_manager,
+                        description=description,
+                    )
+                )
+
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    print(
+        f"{len(entities)} entities, {size} bytes, "
+        f"{size / len(entities):.0f} bytes/entity"
+    )
+
+
+if __name__ == "__main__":
+    main()